@@ -0,0 +1,279 @@
+"""
+离线基准测试：在合成论文库（默认1万/10万/100万篇）上测量主要流程的耗时与峰值内存
+
+- 合成论文库使用当前论文库JSON格式（{主题: {论文ID: 论文记录}}）
+- arXiv Atom响应与PapersWithCode响应由本地HTTP服务按 fixtures/ 中的录制数据回放，全程不访问外网
+- 每个规模分别测量 jsonl（默认后端）与 json 两种论文库后端
+- 每个阶段在独立子进程中运行，各阶段的峰值内存（ru_maxrss）互不影响
+
+用法：
+    python benchmarks/run_benchmarks.py                          # 默认规模：10000 100000 1000000
+    python benchmarks/run_benchmarks.py --sizes 10000 100000     # 指定规模
+    python benchmarks/run_benchmarks.py --backends jsonl         # 只测量指定后端
+    python benchmarks/run_benchmarks.py --output results.json    # 另存结果为JSON
+"""
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import logging
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+FIXTURE_DIR = os.path.join(BENCHMARK_DIR, "fixtures")
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# 本地回放服务不能经过代理
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+sys.path.insert(0, REPO_ROOT)
+
+import arxiv  # noqa: E402
+import daily_arxiv  # noqa: E402
+
+
+# -------------------------- 本地回放服务（替代arXiv与PapersWithCode） --------------------------
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """按路径回放录制的响应：/api/query 返回arXiv Atom，/pwc/papers/<id> 返回PapersWithCode JSON"""
+
+    arxiv_feed = b""
+    empty_feed = b""
+    pwc_official = b""
+    pwc_no_code = b""
+
+    def do_GET(self):
+        parsed_url = urlparse(self.path)
+        if parsed_url.path == "/api/query":
+            # 录制的Atom只有一页：首页之后返回空页
+            start = int(parse_qs(parsed_url.query).get("start", ["0"])[0])
+            self.send_body(self.arxiv_feed if start == 0 else self.empty_feed, "application/atom+xml")
+        elif parsed_url.path.startswith("/pwc/papers/"):
+            # 按论文ID确定性地选择「有代码」或「无代码」响应（约1/3有代码）
+            paper_id = parsed_url.path.rsplit("/", 1)[-1]
+            has_code = zlib.crc32(paper_id.encode("utf-8")) % 3 == 0
+            self.send_body(self.pwc_official if has_code else self.pwc_no_code, "application/json")
+        else:
+            self.send_error(404)
+
+    def send_body(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 不输出访问日志
+
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    """启动本地回放服务，并将arXiv与PapersWithCode的请求地址指向它"""
+    def read_fixture(name: str) -> bytes:
+        with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+            return f.read()
+
+    FixtureRequestHandler.arxiv_feed = read_fixture("arxiv_query.atom")
+    # 空页：去掉所有 <entry>，保留feed头
+    FixtureRequestHandler.empty_feed = re.sub(rb"\s*<entry>.*?</entry>", b"", FixtureRequestHandler.arxiv_feed, flags=re.S)
+    FixtureRequestHandler.pwc_official = read_fixture("pwc_official.json")
+    FixtureRequestHandler.pwc_no_code = read_fixture("pwc_no_code.json")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    arxiv.Client.query_url_format = f"{base_url}/api/query?{{}}"
+    daily_arxiv.PAPERS_WITH_CODE_BASE_URL = f"{base_url}/pwc/papers/"
+    return server
+
+
+# -------------------------- 合成论文库 --------------------------
+def generate_synthetic_store(store_path: str, topics: list[str], num_papers: int,
+                             missing_code_ratio: float, seed: int = 0) -> None:
+    """
+    生成合成论文库（格式与 save_paper_store 写出的文件一致）：论文ID按月份递增，
+    约10%的论文同时属于两个主题，约 missing_code_ratio 的论文没有代码链接
+    """
+    rng = random.Random(seed)
+    topic_papers = {topic: [] for topic in topics}
+    months = [(year, month) for year in range(2015, 2027) for month in range(1, 13)]
+    papers_per_month = max(1, num_papers // len(months) + 1)
+
+    for index in range(num_papers):
+        year, month = months[min(index // papers_per_month, len(months) - 1)]
+        paper_id = f"{year % 100:02d}{month:02d}.{index % papers_per_month + 1:05d}"
+        day = f"{year}-{month:02d}-{rng.randint(1, 28):02d}"
+        record = {
+            "id": paper_id,
+            "title": f"Synthetic Paper {index} on $\\mathcal{{O}}(n)$ {rng.choice(['Odometry', 'Matching', 'Radiance Fields', 'Localization'])}",
+            "authors": [f"Author {rng.randint(1, 50000)}" for _ in range(rng.randint(1, 6))],
+            "version": rng.randint(1, 3),
+            "published": day,
+            "updated": day,
+            "category": rng.choice(["cs.CV", "cs.RO", "cs.GR"]),
+            "comment": rng.choice([None, "8 pages", "Accepted to CVPR"]),
+            "code_url": None if rng.random() < missing_code_ratio else f"https://github.com/synthetic/{paper_id}",
+        }
+        record = {key: value for key, value in record.items() if value is not None}  # 同 PaperRecord.to_dict
+        memberships = [rng.choice(topics)]
+        if rng.random() < 0.1:
+            memberships.append(rng.choice(topics))
+        for topic in dict.fromkeys(memberships):
+            topic_papers[topic].append(record)
+
+    # 逐条写出，避免100万篇论文时在内存中拼接整个JSON字符串
+    with open(store_path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for topic_index, (topic, records) in enumerate(topic_papers.items()):
+            f.write(("," if topic_index else "") + f"{json.dumps(topic)}:{{")
+            for record_index, record in enumerate(records):
+                record_json = json.dumps(record, separators=(",", ":"))
+                f.write(("," if record_index else "") + f"{json.dumps(record['id'])}:{record_json}")
+            f.write("}")
+        f.write("}")
+
+
+# -------------------------- 单个阶段的基准测试（在子进程中运行） --------------------------
+STAGES = ["generate_store", "update_papers_json_file", "update_paper_code_links", "convert_json_to_markdown",
+          "main_workflow"]
+BACKENDS = ["jsonl", "json"]  # 基于文件的论文库后端；jsonl为config.yaml中的默认后端
+
+
+def peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存（MB）；Linux上ru_maxrss单位为KB，macOS上为字节"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def build_config(work_dir: str, backend: str) -> dict:
+    """以 config.yaml 为基础，将所有读写路径指向 work_dir"""
+    config = daily_arxiv.load_config(os.path.join(REPO_ROOT, "config.yaml"))
+    config.update({
+        "update_paper_links": False,
+        "retag_papers": False,
+        "github_fallback": False,  # GitHub备用搜索会访问外网
+        "storage_backend": backend,
+        "journal_compact_day": 0,  # 不按日期压缩日志：结果不随运行日期变化
+        "legacy_json_paths": [],
+        "json_store_path": os.path.join(work_dir, "docs", "cv-arxiv-daily-store.json"),
+        "journal_path": os.path.join(work_dir, "docs", "cv-arxiv-daily-journal.jsonl"),
+        "crawl_state_path": os.path.join(work_dir, "docs", "crawl-state.json"),
+        "md_readme_path": os.path.join(work_dir, "README.md"),
+        "md_gitpage_path": os.path.join(work_dir, "docs", "index.md"),
+        "md_wechat_path": os.path.join(work_dir, "docs", "wechat.md"),
+        "render_cache_dir": os.path.join(work_dir, ".cache", "render"),
+        "pwc_cache_path": os.path.join(work_dir, ".cache", "pwc-cache.sqlite3"),
+        "deferred_queue_path": os.path.join(work_dir, ".cache", "deferred-enrichment.sqlite3"),
+        "run_metrics_path": os.path.join(work_dir, "run_metrics.json"),
+    })
+    return config
+
+
+def run_stage(stage: str, num_papers: int, work_dir: str, backend: str, missing_code_ratio: float) -> dict:
+    """
+    运行一个阶段（之前的阶段已在 work_dir 中留下论文库等文件），返回 {seconds, peak_rss_mb}
+
+    每个阶段独占一个子进程，peak_rss_mb 只反映该阶段（含解释器与模块的基础占用，以及阶段开始前
+    读取论文库等准备工作），不受之前阶段的峰值影响；seconds 只计阶段函数本身
+    """
+    logging.disable(logging.INFO)
+    server = start_fixture_server()
+    config = build_config(work_dir, backend)
+    os.makedirs(os.path.join(work_dir, "docs"), exist_ok=True)
+    daily_arxiv.configure_http_session(config)
+    daily_arxiv.configure_code_link_cache(config)
+    store_path = config["json_store_path"]
+    stats = {}
+
+    def timed(func, *args, **kwargs) -> None:
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+
+    if stage == "generate_store":
+        timed(generate_synthetic_store, store_path, list(config["keywords"]), num_papers, missing_code_ratio)
+        stats["store_mb"] = round(os.path.getsize(store_path) / (1024 * 1024), 1)
+    elif stage == "update_papers_json_file":
+        # 新增一天的论文（由回放的arXiv响应构造，不请求PapersWithCode）
+        feed_results = list(arxiv.Client().results(arxiv.Search(query="benchmark", max_results=10)))
+        new_papers_data = [
+            {topic: {record.id: record
+                     for record in (daily_arxiv.build_paper_record(paper, {}) for paper in feed_results)}}
+            for topic in config["keywords"]
+        ]
+        timed(daily_arxiv.update_papers_json_file, daily_arxiv.open_paper_store(config), new_papers_data)
+    elif stage == "update_paper_code_links":
+        # 补全缺失的代码链接（请求本地PapersWithCode回放服务）
+        timed(daily_arxiv.update_paper_code_links, daily_arxiv.open_paper_store(config))
+    elif stage == "convert_json_to_markdown":
+        # 渲染完整的README（不使用段落缓存与滚动窗口）
+        paper_store = daily_arxiv.open_paper_store(config).load()
+        timed(daily_arxiv.convert_json_to_markdown, paper_store, os.path.join(work_dir, "README.full.md"),
+              task_name="benchmark")
+    elif stage == "main_workflow":
+        # 完整的每日流程（爬取 → 更新论文库 → 渲染所有页面）
+        timed(daily_arxiv.main_workflow, config)
+    else:
+        raise ValueError(f"未知的阶段：{stage}")
+
+    stats["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    server.shutdown()
+    return stats
+
+
+def run_single_size(num_papers: int, backend: str, missing_code_ratio: float) -> dict:
+    """在临时目录中依次运行各阶段（每个阶段一个子进程），返回 {阶段: {seconds, peak_rss_mb}}"""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix=f"arxiv-bench-{num_papers}-{backend}-") as work_dir:
+        for stage in STAGES:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--stage", stage, "--sizes", str(num_papers),
+                 "--backends", backend, "--work-dir", work_dir, "--missing-code-ratio", str(missing_code_ratio)],
+                check=True, stdout=subprocess.PIPE, text=True
+            )
+            results[stage] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return results
+
+
+# -------------------------- 入口 --------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="daily_arxiv.py 离线基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="合成论文库规模（论文数）")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS, help="论文库后端")
+    parser.add_argument("--missing-code-ratio", type=float, default=0.05, help="没有代码链接的论文比例")
+    parser.add_argument("--output", type=str, default=None, help="将结果另存为JSON文件")
+    parser.add_argument("--stage", choices=STAGES, default=None, help=argparse.SUPPRESS)  # 子进程：只运行一个阶段
+    parser.add_argument("--work-dir", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage is not None:
+        print(json.dumps(run_stage(args.stage, args.sizes[0], args.work_dir, args.backends[0],
+                                   args.missing_code_ratio)))
+        return
+
+    all_results = {}
+    for num_papers in args.sizes:
+        for backend in args.backends:
+            results = run_single_size(num_papers, backend, args.missing_code_ratio)
+            all_results.setdefault(num_papers, {})[backend] = results
+
+            print(f"\n== {num_papers} papers, {backend} backend ==")
+            for stage, stats in results.items():
+                print(f"{stage:<28}{stats['seconds']:>10.3f} s{stats['peak_rss_mb']:>10.1f} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(all_results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,853 @@
 # -------------------------- 导入依赖库（按「标准库→第三方库」排序） --------------------------
-# 标准库：文件操作、正则、JSON/XML解析、日志、命令行参数、日期
+# 标准库：文件操作、正则、JSON/XML解析、日志、命令行参数、日期、并发
 import os
 import re
 import json
+import time
+import sqlite3
+import gzip
+import base64
+import hashlib
+import random
+import email.utils
+import tempfile
+from io import StringIO
+import functools
 import logging
 import argparse
 import datetime
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 # 第三方库：arXiv爬取、YAML配置、HTTP请求
 import arxiv
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
 
 
 # -------------------------- 全局常量配置（集中管理，便于修改） --------------------------
 # PapersWithCode API：用于获取论文对应的代码仓库
 PAPERS_WITH_CODE_BASE_URL = "https://arxiv.paperswithcode.com/api/v0/papers/"
-# GitHub搜索API：当PapersWithCode无代码时，备用搜索仓库
+# GitHub搜索API：当PapersWithCode无代码时，备用搜索仓库（设置环境变量 GITHUB_TOKEN 时改用GraphQL API批量搜索）
 GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+# GitHub REST搜索一次最多5个 AND/OR/NOT 运算符，即一次最多合并6篇论文
+GITHUB_SEARCH_MAX_OR_TERMS = 6
+# GitHub GraphQL搜索每次请求合并的论文数（每篇论文一个别名查询）
+DEFAULT_GITHUB_BATCH_SIZE = 20
+# GitHub GraphQL搜索每篇论文取回的候选仓库数（用于跳过论文列表类仓库）
+GITHUB_SEARCH_CANDIDATES = 5
+# README提到同一批次内多少篇论文的仓库视为论文列表（而不是某篇论文的代码）
+GITHUB_LIST_REPO_MIN_MATCHES = 2
+# 论文列表类仓库的仓库名特征（awesome-xxx、paper-list、xxx-arxiv-daily等）
+GITHUB_LIST_REPO_PATTERN = re.compile(r"awesome|papers?[-_]?list|reading[-_]?list|arxiv[-_]?daily|daily[-_]?arxiv", re.I)
 # arXiv基础URL：用于拼接论文详情页链接
 ARXIV_BASE_URL = "http://arxiv.org/"
+# arXiv API使用条款：两次请求之间至少间隔3秒（全局生效，所有线程共享）
+ARXIV_DELAY_SECONDS = 3.0
+# 各接口的默认限速：{主机名 或 「主机名/路径前缀」: (每分钟请求数, 突发容量)}，可通过配置项 rate_limits 覆盖
+DEFAULT_RATE_LIMITS = {
+    "export.arxiv.org": (60 / ARXIV_DELAY_SECONDS, 1),  # arXiv：每3秒1次
+    "api.github.com/search": (10, 10),  # GitHub搜索API（未认证）：每分钟10次
+    "api.github.com/graphql": (30, 5),  # GitHub GraphQL API（认证，搜索有二级限速）：每分钟30次
+}
+# 只允许单连接访问的主机：{主机名: 上一个请求结束后至少等待的秒数}（arXiv要求同一时间只有一个连接）
+SERIAL_HOSTS = {"export.arxiv.org": ARXIV_DELAY_SECONDS}
+# arXiv API单页最多返回的论文数量
+ARXIV_MAX_PAGE_SIZE = 100
+# 同一主机（如PapersWithCode）默认允许的最大并发请求数
+DEFAULT_PER_HOST_CONCURRENCY = 4
+# 瞬时错误（连接失败、超时、429/5xx）的默认重试次数与退避基数（秒）
+DEFAULT_HTTP_MAX_RETRIES = 2
+DEFAULT_HTTP_RETRY_BACKOFF_SECONDS = 1.0
+TRANSIENT_HTTP_STATUS_CODES = {429, 500, 502, 503, 504}
+# 同一主机连续失败多少次后熔断（本次运行内不再请求）
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+# 延后队列中的论文累计失败多少次后移出队列（不再自动重试）
+DEFAULT_DEFERRED_MAX_ATTEMPTS = 5
+# HTTP默认超时（秒）：连接超时、读取超时
+DEFAULT_HTTP_CONNECT_TIMEOUT = 5.0
+DEFAULT_HTTP_READ_TIMEOUT = 30.0
+# HTTP连接池中每个主机保留的长连接数量
+DEFAULT_HTTP_POOL_SIZE = 10
+# 默认User-Agent（标明请求来源，便于服务方识别）
+DEFAULT_USER_AGENT = "cv-arxiv-daily (+https://github.com/Vincentqyw/cv-arxiv-daily)"
+# 「无官方代码」查询结果的默认缓存有效期（天）：基础值，按论文年龄线性增长，不超过上限
+DEFAULT_PWC_NEGATIVE_TTL_DAYS = 1.0
+DEFAULT_PWC_NEGATIVE_TTL_MAX_DAYS = 90.0
+SECONDS_PER_DAY = 24 * 60 * 60
+# 合并爬取模式在增量爬取状态中使用的水位线key
+COMBINED_CRAWL_STATE_KEY = "__combined__"
+
+
+# -------------------------- 并发控制与限速（按主机/接口，跨线程共享） --------------------------
+class TokenBucket:
+    """
+    令牌桶：按固定速率补充令牌，每个请求消耗一个令牌，令牌不足时等待；
+    服务端要求暂停（Retry-After、X-RateLimit-*）时，在指定时间之前不发放令牌
+    """
+    
+    def __init__(self, requests_per_minute: float | None, burst: int = 1):
+        self.rate = requests_per_minute / 60 if requests_per_minute else None  # 每秒补充的令牌数；None表示不限速
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """取得一个令牌（必要时阻塞等待），返回等待的秒数"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                wait_seconds = self.paused_until - now
+                if wait_seconds <= 0:
+                    if self.rate is None:
+                        return waited
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+            waited += wait_seconds
+    
+    def pause(self, seconds: float) -> None:
+        """在 seconds 秒内不再发放令牌（与已有的暂停取较晚者）"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    """
+    按接口限速：每个配置的「主机名」或「主机名/路径前缀」一个令牌桶（按最长前缀匹配），
+    并根据响应头 Retry-After、X-RateLimit-Remaining/X-RateLimit-Reset 暂停对应接口
+    """
+    
+    def __init__(self, limits: dict[str, tuple[float, int]]):
+        self._lock = threading.Lock()
+        self.configure(limits)
+    
+    def configure(self, limits: dict[str, tuple[float, int]]) -> None:
+        """重建所有令牌桶：limits 为 {接口: (每分钟请求数, 突发容量)}"""
+        with self._lock:
+            self._buckets = {endpoint: TokenBucket(rate, burst) for endpoint, (rate, burst) in limits.items()}
+    
+    def bucket(self, url: str) -> TokenBucket:
+        """获取URL对应的令牌桶；未配置的主机使用不限速的桶（仍会遵守服务端的暂停要求）"""
+        parsed_url = urlparse(url)
+        endpoint = parsed_url.netloc + parsed_url.path
+        with self._lock:
+            matches = [key for key in self._buckets if endpoint == key or endpoint.startswith(key.rstrip("/") + "/")]
+            if matches:
+                return self._buckets[max(matches, key=len)]
+            return self._buckets.setdefault(parsed_url.netloc, TokenBucket(None))
+    
+    def acquire(self, url: str) -> None:
+        waited = self.bucket(url).acquire()
+        if waited > 0:
+            _run_metrics.count("rate_limit_wait_ms", int(waited * 1000))
+    
+    def observe(self, url: str, response: requests.Response) -> None:
+        """根据响应头调整限速：Retry-After（429/503）或配额耗尽（X-RateLimit-Remaining为0）时暂停该接口"""
+        pause_seconds = 0.0
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and response.status_code in (429, 503):
+            pause_seconds = parse_retry_after(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0" and response.headers.get("X-RateLimit-Reset"):
+            try:
+                pause_seconds = max(pause_seconds, float(response.headers["X-RateLimit-Reset"]) - time.time())
+            except ValueError:
+                pass
+        if pause_seconds > 0:
+            logging.warning(f"接口 {urlparse(url).netloc} 要求暂停 {pause_seconds:.1f} 秒（状态码：{response.status_code}）")
+            self.bucket(url).pause(pause_seconds)
+
+
+def parse_retry_after(value: str) -> float:
+    """解析Retry-After响应头（秒数或HTTP日期），返回需要等待的秒数"""
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def parse_rate_limits(config: dict) -> dict[str, tuple[float, int]]:
+    """合并默认限速与配置项 rate_limits（{接口: {requests_per_minute, burst}}）"""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for endpoint, limit in (config.get("rate_limits") or {}).items():
+        limits[endpoint] = (float(limit["requests_per_minute"]), int(limit.get("burst", 1)))
+    return limits
+
+
+# 全局接口限速（所有经由共享HTTP会话的请求都会经过；可通过配置项 rate_limits 修改）
+_rate_limiter = HostRateLimiter(DEFAULT_RATE_LIMITS)
+
+
+class HostConcurrencyLimiter:
+    """按主机限制并发请求数：同一主机同时进行的请求不超过 limit 个（跨线程池共享）"""
+    
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+    
+    def set_limit(self, limit: int) -> None:
+        """修改单主机并发上限（应在发起请求前调用，已创建的信号量会被重建）"""
+        with self._lock:
+            self.limit = max(1, limit)
+            self._semaphores = {}
+    
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        """获取URL所属主机的信号量，用法：with limiter.slot(url): ..."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[host]
+
+
+# 全局单主机并发限制（可通过配置项 per_host_concurrency 修改）
+_host_limiter = HostConcurrencyLimiter(DEFAULT_PER_HOST_CONCURRENCY)
+
+
+class SerialHostGate:
+    """
+    单连接主机的访问门：同一主机同时只允许一个请求，且上一个请求结束（响应体读完）至少 interval 秒后
+    才发出下一个请求（令牌桶只限制请求的发出时刻，无法保证这一点）
+    """
+    
+    def __init__(self, intervals: dict[str, float]):
+        self.intervals = dict(intervals)
+        self._locks = {host: threading.Lock() for host in self.intervals}
+        self._last_finished_at = dict.fromkeys(self.intervals, 0.0)
+    
+    @contextmanager
+    def slot(self, url: str):
+        """用法：with gate.slot(url): ...；未配置的主机不受限制"""
+        host = urlparse(url).netloc
+        lock = self._locks.get(host)
+        if lock is None:
+            yield
+            return
+        with lock:
+            wait_seconds = self._last_finished_at[host] + self.intervals[host] - time.monotonic()
+            if wait_seconds > 0:
+                time.sleep(wait_seconds)
+                _run_metrics.count("rate_limit_wait_ms", int(wait_seconds * 1000))
+            try:
+                yield
+            finally:
+                self._last_finished_at[host] = time.monotonic()
+
+
+# 全局单连接主机访问门（arXiv：所有线程、所有主题共享）
+_serial_gate = SerialHostGate(SERIAL_HOSTS)
+
+
+# -------------------------- 失败重试与熔断（代码链接等补充信息的请求） --------------------------
+class CircuitOpenError(requests.RequestException):
+    """主机已熔断：本次运行内不再向该主机发送请求"""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """判断请求错误是否为瞬时错误（熔断、连接失败、超时、429/5xx）；只有瞬时错误值得放入延后队列重试"""
+    if isinstance(error, (CircuitOpenError, requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return (isinstance(error, requests.HTTPError) and response is not None
+            and response.status_code in TRANSIENT_HTTP_STATUS_CODES)
+
+
+class RetryPolicy:
+    """瞬时错误的重试策略：最多重试 max_retries 次，第n次重试前等待 [0, backoff_seconds × 2^n) 秒的随机时长"""
+    
+    def __init__(self, max_retries: int = DEFAULT_HTTP_MAX_RETRIES,
+                 backoff_seconds: float = DEFAULT_HTTP_RETRY_BACKOFF_SECONDS):
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+    
+    def delay(self, attempt: int) -> float:
+        """第 attempt 次重试（从0开始）前的等待时长：带随机抖动的指数退避，避免多个线程同时重试"""
+        return random.uniform(0, self.backoff_seconds * 2 ** attempt)
+
+
+class HostCircuitBreaker:
+    """按主机熔断：同一主机连续失败 threshold 次后，本次运行内不再请求该主机（成功一次即清零）"""
+    
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self._failures = {}
+        self._lock = threading.Lock()
+    
+    def reset(self, threshold: int) -> None:
+        """修改熔断阈值并清空失败计数（每次运行开始时调用）；阈值为0表示不熔断"""
+        with self._lock:
+            self.threshold = threshold
+            self._failures = {}
+    
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return self.threshold > 0 and self._failures.get(host, 0) >= self.threshold
+    
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            if self.threshold <= 0 or self._failures.get(host, 0) < self.threshold:
+                self._failures[host] = 0
+    
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] == self.threshold:
+                logging.warning(f"主机 {host} 连续失败 {self.threshold} 次，本次运行内不再请求该主机")
+
+
+class DeferredEnrichmentQueue:
+    """
+    未能获取补充信息（代码链接）的论文队列：查询遇到瞬时错误或主机熔断的论文放入队列，
+    由之后的每日运行按时间预算逐步重新查询（见 drain_deferred_enrichment）
+    
+    超出 pwc_refresh_budget 的论文不入队列，仍由 update_paper_code_links 按优先级在之后的运行中选取
+    attempts 记录累计失败次数（主机熔断不计入），达到 max_attempts 后移出队列，避免反复重试
+    配置了数据库路径时持久化到SQLite，跨运行保留；否则只保存在内存中
+    """
+    
+    def __init__(self, db_path: str | None = None, max_attempts: int = DEFAULT_DEFERRED_MAX_ATTEMPTS,
+                 table: str = "deferred_enrichment"):
+        self.max_attempts = max_attempts
+        self.table = table  # 表名（内部常量）：同一数据库中可以有多个队列
+        self._lock = threading.Lock()
+        self._conn = None
+        self.open(db_path)
+    
+    def open(self, db_path: str | None) -> None:
+        """（重新）打开队列：db_path 为None时使用内存数据库"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            if db_path:
+                db_dir = os.path.dirname(db_path)
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+            # 多线程共享同一连接，由 self._lock 串行化访问；isolation_level=None 即每次写入立即提交
+            self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False, isolation_level=None)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "paper_id TEXT PRIMARY KEY, reason TEXT, enqueued_at REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 1)"
+            )
+    
+    def add(self, clean_paper_id: str, reason: str, failed: bool = True) -> bool:
+        """
+        放入队列；已在队列中时更新原因（保留最初的入队时间）
+        
+        Args:
+            clean_paper_id: 不含版本号的论文ID
+            reason: 延后的原因（错误信息）
+            failed: 是否为一次失败的查询（计入失败次数）；主机熔断等未发出请求的情况为False
+        Returns:
+            是否仍在队列中（累计失败次数达到 max_attempts 时移出队列，返回False）
+        """
+        increment = 1 if failed else 0
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO {self.table} (paper_id, reason, enqueued_at, attempts) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(paper_id) DO UPDATE SET reason = excluded.reason, attempts = attempts + ?",
+                (clean_paper_id, reason, time.time(), increment, increment)
+            )
+            attempts = self._conn.execute(
+                f"SELECT attempts FROM {self.table} WHERE paper_id = ?", (clean_paper_id,)
+            ).fetchone()[0]
+            if self.max_attempts <= 0 or attempts < self.max_attempts:
+                return True
+            self._conn.execute(f"DELETE FROM {self.table} WHERE paper_id = ?", (clean_paper_id,))
+        logging.warning(f"论文ID {clean_paper_id} 已失败 {attempts} 次，移出延后队列（最后一次错误：{reason}）")
+        return False
+    
+    def discard(self, clean_paper_ids: list[str]) -> None:
+        """从队列中移除"""
+        with self._lock:
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE paper_id = ?",
+                                   [(clean_paper_id,) for clean_paper_id in clean_paper_ids])
+    
+    def pending(self) -> list[str]:
+        """队列中的论文ID，最早入队的在前"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                f"SELECT paper_id FROM {self.table} ORDER BY enqueued_at, paper_id"
+            )]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+# 全局重试策略、熔断器与延后队列（main_workflow开始时按配置重置）
+_retry_policy = RetryPolicy()
+_circuit_breaker = HostCircuitBreaker(DEFAULT_CIRCUIT_BREAKER_THRESHOLD)
+_deferred_enrichment = DeferredEnrichmentQueue()
+# GitHub备用搜索请求失败的论文（与代码链接队列同库不同表，由 drain_deferred_enrichment 一并处理）
+_deferred_github_search = DeferredEnrichmentQueue(table="deferred_github_search")
+
+
+# -------------------------- 运行指标（各阶段耗时与计数，运行结束时写入run_metrics.json） --------------------------
+class RunMetrics:
+    """线程安全的运行指标收集器：各阶段耗时/调用次数、通用计数器、按主机统计的HTTP请求"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """清空所有指标（每次运行开始时调用）"""
+        with self._lock:
+            self.started_at = time.time()
+            self._started_monotonic = time.monotonic()
+            self.stages = {}
+            self.counters = {}
+            self.http = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        """统计代码块的耗时与调用次数，用法：with metrics.stage("name"): ..."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                stage = self.stages.setdefault(name, {"calls": 0, "wall_time_seconds": 0.0})
+                stage["calls"] += 1
+                stage["wall_time_seconds"] += elapsed
+    
+    def timed(self, name: str):
+        """装饰器形式的 stage：统计函数每次调用的耗时"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def count(self, name: str, value: int = 1) -> None:
+        """累加计数器（如读写字节数）"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def record_http(self, host: str, status: int | str, num_bytes: int) -> None:
+        """记录一次HTTP响应：按主机统计请求数、响应字节数与状态码分布"""
+        with self._lock:
+            host_stats = self.http.setdefault(host, {"requests": 0, "bytes": 0, "status": {}})
+            host_stats["requests"] += 1
+            host_stats["bytes"] += num_bytes
+            host_stats["status"][str(status)] = host_stats["status"].get(str(status), 0) + 1
+    
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": datetime.datetime.fromtimestamp(self.started_at, datetime.timezone.utc).isoformat(),
+                "wall_time_seconds": round(time.monotonic() - self._started_monotonic, 3),
+                "stages": {
+                    name: {"calls": stage["calls"], "wall_time_seconds": round(stage["wall_time_seconds"], 3)}
+                    for name, stage in sorted(self.stages.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+                "http": dict(sorted(self.http.items())),
+            }
+    
+    def write(self, file_path: str) -> None:
+        """将指标写入JSON文件（机器可读，便于在CI中比较各次运行）"""
+        file_dir = os.path.dirname(file_path)
+        if file_dir:
+            os.makedirs(file_dir, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+# 全局运行指标（main_workflow开始时重置，结束时写入配置项 run_metrics_path）
+_run_metrics = RunMetrics()
+
+
+# -------------------------- HTTP客户端（共享连接池，所有外部请求统一出口） --------------------------
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    带默认超时与限速的HTTP适配器：调用方未指定timeout时使用默认值，避免请求无限挂起；
+    每个请求发出前经过 _rate_limiter 限速，收到响应后按响应头调整限速；
+    单连接主机（SERIAL_HOSTS）的请求在 _serial_gate 内逐个进行
+    """
+    
+    def __init__(self, timeout: tuple[float, float], **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        with _serial_gate.slot(request.url):
+            _rate_limiter.acquire(request.url)
+            response = super().send(request, **kwargs)
+            if not kwargs.get("stream"):
+                response.content  # 在占用连接期间读完响应体，请求结束时刻才准确
+        _rate_limiter.observe(request.url, response)
+        return response
+
+
+class CassetteHTTPAdapter(TimeoutHTTPAdapter):
+    """
+    录制/回放HTTP请求的适配器：录制模式下正常请求并将响应保存到目录，回放模式下只从目录读取响应，
+    不访问网络（用于离线、可重复的性能分析与回归测试）
+    
+    每个请求（方法 + URL + 请求体）保存为一个JSON文件，文件名为其摘要
+    """
+    
+    def __init__(self, timeout: tuple[float, float], cassette_dir: str, replay: bool = False, **kwargs):
+        self.cassette_dir = cassette_dir
+        self.replay = replay
+        os.makedirs(cassette_dir, exist_ok=True)
+        super().__init__(timeout, **kwargs)
+    
+    def cassette_path(self, request: requests.PreparedRequest) -> str:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key = f"{request.method} {request.url} {hashlib.sha256(body).hexdigest()}"
+        return os.path.join(self.cassette_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".json")
+    
+    def send(self, request, **kwargs):
+        cassette_path = self.cassette_path(request)
+        if self.replay:
+            if not os.path.exists(cassette_path):
+                raise requests.ConnectionError(f"回放目录中没有该请求的录制：{request.method} {request.url}", request=request)
+            with open(cassette_path, "r", encoding="utf-8") as f:
+                return self.build_replayed_response(request, json.load(f))
+        
+        response = super().send(request, **kwargs)
+        # 保存解压后的响应体，去掉与原始传输编码相关的头
+        headers = {key: value for key, value in response.headers.items()
+                   if key.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        write_text_if_changed(cassette_path, json.dumps({
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "headers": headers,
+            # 响应体按原始字节保存（base64），非UTF-8编码的响应同样可以录制
+            "body_base64": base64.b64encode(response.content).decode("ascii"),
+        }, indent=2, ensure_ascii=False))
+        return response
+    
+    def build_replayed_response(self, request: requests.PreparedRequest, cassette: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = cassette["status"]
+        response.headers = requests.structures.CaseInsensitiveDict(cassette["headers"])
+        if "body_base64" in cassette:
+            response._content = base64.b64decode(cassette["body_base64"])
+        else:
+            response._content = cassette["body"].encode("utf-8", errors="surrogateescape")  # 早期录制的文本格式
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+
+def record_http_metrics(response: requests.Response, *args, **kwargs) -> None:
+    """响应钩子：将每个HTTP响应的主机、状态码与响应大小记入运行指标"""
+    _run_metrics.record_http(urlparse(response.url).netloc, response.status_code, len(response.content or b""))
+
+
+def build_http_session(connect_timeout: float = DEFAULT_HTTP_CONNECT_TIMEOUT,
+                       read_timeout: float = DEFAULT_HTTP_READ_TIMEOUT,
+                       pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+                       user_agent: str = DEFAULT_USER_AGENT,
+                       record_dir: str | None = None,
+                       replay_dir: str | None = None) -> requests.Session:
+    """
+    构造共享的HTTP会话：keep-alive连接池复用TCP/TLS连接，默认开启gzip，统一超时与User-Agent
+    
+    Args:
+        connect_timeout: 连接超时（秒）
+        read_timeout: 读取超时（秒）
+        pool_size: 每个主机保留的长连接数量（应不小于并发请求数）
+        user_agent: 默认User-Agent
+        record_dir: 录制目录：所有请求的响应保存到该目录（见 CassetteHTTPAdapter）
+        replay_dir: 回放目录：只从该目录读取响应，不访问网络；优先于 record_dir
+    Returns:
+        配置好的 requests.Session
+    """
+    session = requests.Session()
+    adapter_kwargs = {
+        "timeout": (connect_timeout, read_timeout),
+        "pool_connections": pool_size,
+        "pool_maxsize": pool_size,
+    }
+    if replay_dir:
+        adapter = CassetteHTTPAdapter(cassette_dir=replay_dir, replay=True, **adapter_kwargs)
+    elif record_dir:
+        adapter = CassetteHTTPAdapter(cassette_dir=record_dir, **adapter_kwargs)
+    else:
+        adapter = TimeoutHTTPAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    session.hooks["response"].append(record_http_metrics)
+    return session
+
+
+_http_session = None
+
+
+def configure_http_session(config: dict) -> requests.Session:
+    """
+    根据配置重建全局HTTP会话（配置项：http_connect_timeout、http_read_timeout、http_pool_size、user_agent，
+    以及命令行 --record / --replay 设置的 http_record_dir、http_replay_dir）
+    
+    Args:
+        config: 完整配置字典
+    Returns:
+        新的全局 requests.Session
+    """
+    global _http_session
+    _http_session = build_http_session(
+        connect_timeout=float(config.get("http_connect_timeout", DEFAULT_HTTP_CONNECT_TIMEOUT)),
+        read_timeout=float(config.get("http_read_timeout", DEFAULT_HTTP_READ_TIMEOUT)),
+        pool_size=int(config.get("http_pool_size", DEFAULT_HTTP_POOL_SIZE)),
+        user_agent=config.get("user_agent", DEFAULT_USER_AGENT),
+        record_dir=config.get("http_record_dir"),
+        replay_dir=config.get("http_replay_dir")
+    )
+    return _http_session
+
+
+def get_http_session() -> requests.Session:
+    """获取全局HTTP会话（首次调用时按默认配置创建）"""
+    global _http_session
+    if _http_session is None:
+        _http_session = build_http_session()
+    return _http_session
+
+
+def request_with_retries(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    经全局HTTP会话发送请求：瞬时错误（连接失败、超时、429/5xx）按 _retry_policy 重试；
+    同一主机连续失败达到阈值后熔断（见 _circuit_breaker），之后的请求直接失败而不再等待超时
+    
+    同一主机的并发请求数受 _host_limiter 限制
+    Args:
+        method: HTTP方法（如 "GET"、"POST"）
+        url: 请求URL
+        **kwargs: 传给 requests.Session.request 的其他参数
+    Returns:
+        响应（非瞬时错误的4xx响应同样返回，由调用方处理）
+    Raises:
+        CircuitOpenError: 主机已熔断
+        requests.RequestException: 重试耗尽后仍失败
+    """
+    host = urlparse(url).netloc
+    for attempt in range(_retry_policy.max_retries + 1):
+        if _circuit_breaker.is_open(host):
+            raise CircuitOpenError(f"主机 {host} 已熔断")
+        try:
+            with _host_limiter.slot(url):
+                response = get_http_session().request(method, url, **kwargs)
+            if response.status_code not in TRANSIENT_HTTP_STATUS_CODES:
+                _circuit_breaker.record_success(host)
+                return response
+            error = requests.HTTPError(f"{response.status_code} Error for url: {response.url}", response=response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        _circuit_breaker.record_failure(host)
+        if attempt < _retry_policy.max_retries:
+            _run_metrics.count("http_retries")
+            time.sleep(_retry_policy.delay(attempt))
+    raise error
+
+
+# -------------------------- 代码链接缓存（SQLite持久化，跨运行复用） --------------------------
+class CodeLinkCache:
+    """
+    PapersWithCode查询结果的本地缓存（key为不含版本号的论文ID），同时记录每篇论文的查询时间与次数
+    
+    - 查到官方代码：永久缓存
+    - 「无官方代码」：缓存有效期 = 基础有效期 ×（1 + 论文月龄）× 2^(连续未查到次数 - 1)，不超过上限；
+      过期后重新查询（论文越老、查询未果的次数越多，重新查询的间隔越长）
+    - 请求失败：不缓存
+    """
+    
+    def __init__(self, db_path: str,
+                 negative_ttl_days: float = DEFAULT_PWC_NEGATIVE_TTL_DAYS,
+                 negative_ttl_max_days: float = DEFAULT_PWC_NEGATIVE_TTL_MAX_DAYS):
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.negative_ttl_days = negative_ttl_days
+        self.negative_ttl_max_days = negative_ttl_max_days
+        self._lock = threading.Lock()
+        # 多线程共享同一连接，由 self._lock 串行化访问；isolation_level=None 即每次写入立即提交
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pwc_code_links ("
+            "paper_id TEXT PRIMARY KEY, code_url TEXT, checked_at REAL NOT NULL, check_count INTEGER NOT NULL DEFAULT 1)"
+        )
+        # 兼容早期创建的缓存：补充查询次数列（已有记录视为查询过1次）
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pwc_code_links)")}
+        if "check_count" not in columns:
+            self._conn.execute("ALTER TABLE pwc_code_links ADD COLUMN check_count INTEGER NOT NULL DEFAULT 1")
+        # PapersWithCode离线数据（links-between-papers-and-code.json.gz）导入的官方代码链接索引
+        self._conn.execute("CREATE TABLE IF NOT EXISTS pwc_dump_links (paper_id TEXT PRIMARY KEY, code_url TEXT NOT NULL)")
+        # GitHub备用搜索的结果（未找到仓库时 code_url 为NULL，按「无官方代码」的有效期过期）
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS github_code_links (paper_id TEXT PRIMARY KEY, code_url TEXT, checked_at REAL NOT NULL)"
+        )
+    
+    def negative_ttl_seconds(self, clean_paper_id: str, check_count: int = 1) -> float:
+        """计算「无官方代码」结果的有效期：论文越老、连续未查到代码的次数越多，有效期越长"""
+        age_months = paper_age_days(clean_paper_id) / 30
+        backoff = 2 ** min(max(check_count - 1, 0), 16)
+        ttl_days = min(self.negative_ttl_days * (1 + age_months) * backoff, self.negative_ttl_max_days)
+        return ttl_days * SECONDS_PER_DAY
+    
+    def lookup(self, clean_paper_id: str) -> tuple[bool, str | None, int]:
+        """
+        查询缓存及查询记录
+        
+        Returns:
+            (是否命中, 代码链接, 已查询次数)；命中「无官方代码」时代码链接为None；从未查询过时次数为0
+        """
+        with self._lock:
+            # 优先使用离线数据中的官方代码链接
+            dump_row = self._conn.execute(
+                "SELECT code_url FROM pwc_dump_links WHERE paper_id = ?", (clean_paper_id,)
+            ).fetchone()
+            if dump_row is not None:
+                return True, dump_row[0], 0
+            row = self._conn.execute(
+                "SELECT code_url, checked_at, check_count FROM pwc_code_links WHERE paper_id = ?",
+                (clean_paper_id,)
+            ).fetchone()
+        if row is None:
+            return False, None, 0
+        code_url, checked_at, check_count = row
+        if code_url:
+            return True, code_url, check_count
+        if time.time() - checked_at < self.negative_ttl_seconds(clean_paper_id, check_count):
+            return True, None, check_count
+        return False, None, check_count
+    
+    def get(self, clean_paper_id: str) -> tuple[bool, str | None]:
+        """
+        查询缓存
+        
+        Returns:
+            (是否命中, 代码链接)；命中「无官方代码」时代码链接为None
+        """
+        hit, code_url, _ = self.lookup(clean_paper_id)
+        return hit, code_url
+    
+    def put(self, clean_paper_id: str, code_url: str | None) -> None:
+        """写入一条查询结果：更新查询时间，查询次数加1"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pwc_code_links (paper_id, code_url, checked_at, check_count) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT(paper_id) DO UPDATE SET code_url = excluded.code_url, "
+                "checked_at = excluded.checked_at, check_count = check_count + 1",
+                (clean_paper_id, code_url, time.time())
+            )
+    
+    def get_github(self, clean_paper_id: str) -> tuple[bool, str | None]:
+        """
+        查询GitHub备用搜索的缓存
+        
+        Returns:
+            (是否命中, 仓库链接)；命中「未找到仓库」时仓库链接为None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT code_url, checked_at FROM github_code_links WHERE paper_id = ?", (clean_paper_id,)
+            ).fetchone()
+        if row is None:
+            return False, None
+        code_url, checked_at = row
+        if code_url or time.time() - checked_at < self.negative_ttl_seconds(clean_paper_id):
+            return True, code_url
+        return False, None
+    
+    def put_github(self, clean_paper_id: str, code_url: str | None) -> None:
+        """写入一条GitHub备用搜索结果"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO github_code_links (paper_id, code_url, checked_at) VALUES (?, ?, ?)",
+                (clean_paper_id, code_url, time.time())
+            )
+    
+    def replace_dump_links(self, dump_links) -> int:
+        """
+        用离线数据重建官方代码链接索引（在一个事务中替换，中途失败时保留原索引）
+        
+        Args:
+            dump_links: 可迭代的 (论文ID, 代码链接)；同一论文出现多次时保留第一条
+        Returns:
+            导入的论文数
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM pwc_dump_links")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO pwc_dump_links (paper_id, code_url) VALUES (?, ?)", dump_links
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM pwc_dump_links").fetchone()[0]
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return count
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_code_link_cache = None
+
+
+def configure_code_link_cache(config: dict) -> CodeLinkCache | None:
+    """
+    根据配置打开全局代码链接缓存（配置项：pwc_cache_path、pwc_negative_ttl_days、pwc_negative_ttl_max_days）
+    
+    Args:
+        config: 完整配置字典；未配置 pwc_cache_path 时不启用缓存
+    Returns:
+        CodeLinkCache 实例；未启用时返回None
+    """
+    global _code_link_cache
+    if _code_link_cache is not None:
+        _code_link_cache.close()
+        _code_link_cache = None
+    
+    cache_path = config.get("pwc_cache_path")
+    if cache_path:
+        _code_link_cache = CodeLinkCache(
+            cache_path,
+            negative_ttl_days=float(config.get("pwc_negative_ttl_days", DEFAULT_PWC_NEGATIVE_TTL_DAYS)),
+            negative_ttl_max_days=float(config.get("pwc_negative_ttl_max_days", DEFAULT_PWC_NEGATIVE_TTL_MAX_DAYS))
+        )
+    return _code_link_cache
 
 
 # -------------------------- 日志配置（统一日志格式，便于调试） --------------------------
@@ -52,355 +880,1797 @@ def parse_filter_keywords(filters: list) -> str:
         else:
             formatted_filter += filter_word
         
-        # 除了最后一个关键词，后面都加OR分隔符
-        if idx != len(filters) - 1:
-            formatted_filter += OR_SEPARATOR
+        # 除了最后一个关键词，后面都加OR分隔符
+        if idx != len(filters) - 1:
+            formatted_filter += OR_SEPARATOR
+    
+    return formatted_filter
+
+
+def process_config_keywords(config: dict) -> dict:
+    """
+    处理配置文件中的关键词，将每个主题对应的过滤器格式化为搜索字符串
+    
+    Args:
+        config: 原始配置字典，需包含 "keywords" 字段（例如 {"SLAM": {"filters": ["SLAM", "3D"]}}）
+    Returns:
+        新增 "formatted_keywords" 字段的配置字典，存储格式化后的搜索词
+    """
+    formatted_keywords = {}
+    # 遍历每个主题（如"SLAM"）及其对应的过滤器列表
+    for topic, topic_config in config["keywords"].items():
+        formatted_keywords[topic] = parse_filter_keywords(topic_config["filters"])
+    
+    return formatted_keywords
+
+
+def load_config(config_file_path: str) -> dict:
+    """
+    加载YAML配置文件，并处理关键词过滤器
+    
+    Args:
+        config_file_path: 配置文件路径（如 "config.yaml"）
+    Returns:
+        完整配置字典，包含原始配置 + 格式化后的关键词（formatted_keywords字段）
+    """
+    # 读取YAML配置文件
+    with open(config_file_path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+    
+    # 处理关键词过滤器，添加到配置中
+    config["formatted_keywords"] = process_config_keywords(config)
+    
+    logging.info(f"成功加载配置：{config}")
+    return config
+
+
+def format_authors(authors: list, only_first_author: bool = False) -> str:
+    """
+    格式化论文作者列表，支持返回「第一作者」或「所有作者」
+    
+    Args:
+        authors: arxiv库返回的作者对象列表
+        only_first_author: 若为True，仅返回第一作者；否则返回所有作者（逗号分隔）
+    Returns:
+        格式化后的作者字符串，例如 "张三 et.al." 或 "张三, 李四, 王五"
+    """
+    # 转换作者对象为字符串（arxiv.Author对象的__str__为姓名）
+    author_names = [str(author) for author in authors]
+    
+    if only_first_author:
+        # 仅返回第一作者，后面加 "et.al." 表示等作者
+        return f"{author_names[0]} et.al." if author_names else "Unknown Author"
+    else:
+        # 返回所有作者，用逗号分隔
+        return ", ".join(author_names) if author_names else "Unknown Authors"
+
+
+def sort_papers_by_id_desc(papers: dict) -> dict:
+    """
+    按论文ID倒序排序（论文ID含时间信息，倒序即最新的在前）
+    
+    Args:
+        papers: 论文字典，key为论文ID（如 "2108.09112"），value为论文记录
+    Returns:
+        按论文ID倒序排列后的新字典
+    """
+    sorted_paper_ids = sorted(papers.keys(), reverse=True)
+    return {paper_id: papers[paper_id] for paper_id in sorted_paper_ids}
+
+
+# 输出文件中每天都会变化的日期（标题中的更新日期、「返回顶部」锚点），比较内容时忽略
+VOLATILE_DATE_PATTERN = re.compile(r"(Updated on |#updated-on-)[0-9.]+")
+
+
+def write_text_if_changed(file_path: str, content: str, volatile_pattern: re.Pattern | None = None) -> bool:
+    """
+    仅当内容变化时写入文件：先比较新旧内容的摘要，不同时写入同目录临时文件再原子替换
+    
+    Args:
+        file_path: 目标文件路径
+        content: 新内容
+        volatile_pattern: 比较时忽略的部分（如每天变化的日期）；仅这部分不同视为未变化
+    Returns:
+        是否写入了文件
+    """
+    def content_digest(text: str) -> str:
+        if volatile_pattern is not None:
+            text = volatile_pattern.sub(r"\1", text)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            if content_digest(f.read()) == content_digest(content):
+                logging.info(f"内容未变化，跳过写入：{file_path}")
+                _run_metrics.count("files_unchanged")
+                return False
+    
+    # 写入临时文件后原子替换，避免中途失败留下不完整的文件
+    file_dir = os.path.dirname(os.path.abspath(file_path))
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=file_dir, delete=False,
+                                     prefix=".tmp-", suffix=os.path.basename(file_path)) as f:
+        f.write(content)
+        temp_path = f.name
+    # 临时文件默认权限为0600，沿用原文件权限（新文件使用0644）
+    file_mode = os.stat(file_path).st_mode & 0o777 if os.path.exists(file_path) else 0o644
+    os.chmod(temp_path, file_mode)
+    os.replace(temp_path, file_path)
+    _run_metrics.count("files_written")
+    _run_metrics.count("bytes_written", len(content.encode("utf-8")))
+    return True
+
+
+def iter_json_array(text_stream, chunk_size: int = 1 << 20):
+    """
+    流式解析JSON数组：逐块读取文本，逐个产出数组元素，内存占用与单个元素大小相当而非整个文件
+    
+    Args:
+        text_stream: 以文本模式打开的文件对象（内容为一个元素均为对象的JSON数组）
+        chunk_size: 每次读取的字符数
+    Yields:
+        数组中的每个元素
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    while True:
+        # 跳过空白、数组起始符与元素分隔符
+        while position < len(buffer):
+            char = buffer[position]
+            if char == "[" and not started:
+                started = True
+            elif not (char.isspace() or char == ","):
+                break
+            position += 1
+        if position < len(buffer) and buffer[position] == "]" and started:
+            return
+        if position < len(buffer):
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+                yield element
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            return
+        # 缓冲区中没有完整的元素：丢弃已解析部分，读入下一块
+        buffer = buffer[position:]
+        position = 0
+        chunk = text_stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def get_clean_paper_id(raw_paper_id: str) -> str:
+    """
+    去除论文ID中的版本号
+    
+    Args:
+        raw_paper_id: 原始论文ID（如 "2108.09112v1"）
+    Returns:
+        不含版本号的论文ID（如 "2108.09112"）
+    """
+    version_pos = raw_paper_id.find("v")  # 查找版本号起始位置
+    return raw_paper_id[:version_pos] if version_pos != -1 else raw_paper_id
+
+
+def parse_paper_id_month(clean_paper_id: str) -> tuple[int, int] | None:
+    """
+    解析论文ID中的提交年月：arXiv ID以「年月」开头（如 "2108.09112" 为2021年8月，
+    旧格式 "cs/0701001" 为2007年1月）
+    
+    Args:
+        clean_paper_id: 不含版本号的论文ID
+    Returns:
+        (年, 月)；无法解析时返回None
+    """
+    match = re.match(r"^(?:[a-z\-]+(?:\.[A-Z]{2})?/)?(\d{2})(\d{2})", clean_paper_id)
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    if not 1 <= month <= 12:
+        return None
+    # 2位年份：91~99为1990年代（arXiv始于1991年），其余为2000年后
+    year += 1900 if year >= 91 else 2000
+    return year, month
+
+
+def get_paper_month(clean_paper_id: str) -> str:
+    """
+    获取论文的提交月份标签（如 "2021-08"），用于按月归档；无法解析时返回 "unknown"
+    
+    Args:
+        clean_paper_id: 不含版本号的论文ID
+    Returns:
+        月份标签
+    """
+    year_month = parse_paper_id_month(clean_paper_id)
+    if year_month is None:
+        return "unknown"
+    return f"{year_month[0]:04d}-{year_month[1]:02d}"
+
+
+def paper_age_days(clean_paper_id: str) -> float:
+    """
+    根据论文ID中的提交年月估算论文年龄（天）；无法解析时返回0
+    
+    Args:
+        clean_paper_id: 不含版本号的论文ID
+    Returns:
+        距论文提交月份第一天的天数
+    """
+    year_month = parse_paper_id_month(clean_paper_id)
+    if year_month is None:
+        return 0.0
+    age = datetime.date.today() - datetime.date(year_month[0], year_month[1], 1)
+    return max(age.days, 0)
+
+
+def github_id_pattern(clean_paper_id: str) -> re.Pattern:
+    """论文ID在文本中的匹配模式（允许带版本号，不匹配更长数字串的一部分）"""
+    return re.compile(rf"(?<![\d.]){re.escape(clean_paper_id)}(?!\d)")
+
+
+def is_github_list_repo(repo_url: str) -> bool:
+    """按仓库名判断是否为论文列表类仓库（awesome-xxx、xxx-arxiv-daily等），这类仓库不是论文的代码"""
+    return GITHUB_LIST_REPO_PATTERN.search(urlparse(repo_url).path) is not None
+
+
+def search_github_code(clean_paper_ids: list[str]) -> dict[str, str | None]:
+    """
+    用一次GitHub REST搜索查找一批论文的相关仓库（README中提到论文ID的仓库，按星数排序取Top1）
+    
+    多篇论文用 OR 合并为一个查询；返回的仓库按匹配片段（text-match）中出现的论文ID归属到论文，
+    只搜索一篇论文时同样要求匹配片段中出现该论文ID。
+    论文列表类仓库（按仓库名判断，或README提到批次内 GITHUB_LIST_REPO_MIN_MATCHES 篇及以上论文）被丢弃；
+    多篇论文的批次中存在无法归属的仓库时，未归属的论文本次无法判断，不出现在返回结果中
+    （由调用方放入延后队列逐篇搜索，见 resolve_github_code_links），不在本次运行中追加请求
+    Args:
+        clean_paper_ids: 不含版本号的论文ID列表（不超过 GITHUB_SEARCH_MAX_OR_TERMS 篇）
+    Returns:
+        字典：key为论文ID，value为仓库HTML链接（未找到时为None）；无法判断的论文不包含在内
+    Raises:
+        requests.RequestException: 请求失败（含熔断）
+    """
+    # 构造GitHub搜索参数：按星数降序，优先找高星仓库
+    params = {
+        "q": " OR ".join(f'"{clean_paper_id}"' for clean_paper_id in clean_paper_ids) + " in:readme",
+        "sort": "stars",
+        "order": "desc",
+        "per_page": 100
+    }
+    # text-match：响应中附带每个仓库的匹配片段，用于将仓库归属到论文
+    headers = {"Accept": "application/vnd.github.text-match+json"}
+    response = request_with_retries("GET", GITHUB_SEARCH_URL, params=params, headers=headers)
+    response.raise_for_status()
+    items = [item for item in response.json().get("items", []) if not is_github_list_repo(item["html_url"])]
+    
+    code_urls = dict.fromkeys(clean_paper_ids)
+    patterns = {clean_paper_id: github_id_pattern(clean_paper_id) for clean_paper_id in clean_paper_ids}
+    has_unmatched_items = False
+    for item in items:  # 已按星数降序
+        fragments = " ".join(match.get("fragment", "") for match in item.get("text_matches", []))
+        matched_ids = [clean_paper_id for clean_paper_id, pattern in patterns.items() if pattern.search(fragments)]
+        has_unmatched_items = has_unmatched_items or not matched_ids
+        if len(matched_ids) >= GITHUB_LIST_REPO_MIN_MATCHES:
+            continue  # 同时提到多篇论文：论文列表类仓库
+        for clean_paper_id in matched_ids:
+            code_urls[clean_paper_id] = code_urls[clean_paper_id] or item["html_url"]
+    
+    if has_unmatched_items and len(clean_paper_ids) > 1:
+        # 无法归属的仓库可能属于任一未归属的论文：这些论文本次不下结论
+        code_urls = {clean_paper_id: code_url for clean_paper_id, code_url in code_urls.items() if code_url}
+    return code_urls
+
+
+def search_github_code_graphql(clean_paper_ids: list[str], token: str) -> dict[str, str | None]:
+    """
+    用一次GitHub GraphQL请求查找一批论文的相关仓库：每篇论文一个别名搜索（README中提到论文ID，按星数排序）
+    
+    论文列表类仓库（按仓库名判断，或出现在批次内 GITHUB_LIST_REPO_MIN_MATCHES 篇及以上论文的结果中）被丢弃，
+    每篇论文取剩余结果中的Top1
+    Args:
+        clean_paper_ids: 不含版本号的论文ID列表
+        token: GitHub访问令牌（GraphQL API必须认证）
+    Returns:
+        字典：key为论文ID，value为仓库HTML链接（未找到时为None）
+    Raises:
+        requests.RequestException: 请求失败（含熔断）
+        RuntimeError: GraphQL返回错误且没有数据
+    """
+    aliases = []
+    for index, clean_paper_id in enumerate(clean_paper_ids):
+        search_query = json.dumps(f'"{clean_paper_id}" in:readme sort:stars-desc')
+        aliases.append(f"p{index}: search(query: {search_query}, type: REPOSITORY, first: {GITHUB_SEARCH_CANDIDATES}) "
+                       "{ nodes { ... on Repository { url } } }")
+    query = "query {\n  " + "\n  ".join(aliases) + "\n}"
+    
+    response = request_with_retries("POST", GITHUB_GRAPHQL_URL, json={"query": query},
+                                    headers={"Authorization": f"bearer {token}"})
+    response.raise_for_status()
+    payload = response.json()
+    data = payload.get("data")
+    if not data:
+        raise RuntimeError(f"GitHub GraphQL搜索失败：{payload.get('errors')}")
+    
+    candidates = {}
+    for index, clean_paper_id in enumerate(clean_paper_ids):
+        nodes = (data.get(f"p{index}") or {}).get("nodes") or []
+        candidates[clean_paper_id] = list(dict.fromkeys(node["url"] for node in nodes if node.get("url")))
+    # 每个仓库出现在多少篇论文的结果中
+    repo_counts = {}
+    for repo_urls in candidates.values():
+        for repo_url in repo_urls:
+            repo_counts[repo_url] = repo_counts.get(repo_url, 0) + 1
+    
+    code_urls = {}
+    for clean_paper_id, repo_urls in candidates.items():
+        code_urls[clean_paper_id] = next(
+            (repo_url for repo_url in repo_urls
+             if repo_counts[repo_url] < GITHUB_LIST_REPO_MIN_MATCHES and not is_github_list_repo(repo_url)),
+            None
+        )
+    return code_urls
+
+
+def get_paper_watermark(paper: arxiv.Result) -> dict:
+    """
+    生成论文的「水位线」：提交时间 + 不含版本号的论文ID（用于增量爬取时判断论文是否已爬取过）
+    
+    Args:
+        paper: arxiv.Result 对象
+    Returns:
+        {"published": ISO格式提交时间, "id": 论文ID}
+    """
+    return {"published": paper.published.isoformat(), "id": get_clean_paper_id(paper.get_short_id())}
+
+
+def is_at_or_below_watermark(paper: arxiv.Result, watermark: dict) -> bool:
+    """判断论文是否不晚于水位线（即上次运行时已经爬取过）"""
+    paper_watermark = get_paper_watermark(paper)
+    return (paper_watermark["published"], paper_watermark["id"]) <= (watermark["published"], watermark["id"])
+
+
+@_run_metrics.timed("arxiv_search")
+def fetch_arxiv_results(search_query: str, max_results: int, watermark: dict | None = None,
+                        page_size: int | None = None) -> list[arxiv.Result]:
+    """
+    执行arXiv搜索并一次性取回全部结果（按提交日期排序，最新的在前）
+    
+    arXiv的访问规则由 _serial_gate 与 _rate_limiter 保证（跨线程、跨主题生效）：同一时间只有一个请求，
+    上一页响应读完后至少间隔 ARXIV_DELAY_SECONDS 秒
+    
+    Args:
+        search_query: 格式化后的arXiv搜索关键词
+        max_results: 最多爬取的论文数量
+        watermark: 上次爬取到的最新论文（见 get_paper_watermark）；给定时逐页向后翻，
+                   遇到不晚于水位线的论文即停止，只返回新论文
+        page_size: 每页请求的论文数量（默认与 max_results 相同，不超过 ARXIV_MAX_PAGE_SIZE）
+    Returns:
+        arxiv.Result 对象列表
+    """
+    # 请求间隔由 _serial_gate 与 _rate_limiter 统一控制（回放录制的响应时不经过限速），关闭arxiv库自带的单客户端延迟
+    arxiv_client = arxiv.Client(
+        page_size=min(page_size or max_results, ARXIV_MAX_PAGE_SIZE),
+        delay_seconds=0
+    )
+    # arxiv库未提供传入会话的参数，替换其内部会话以复用全局连接池与超时设置（arxiv版本已在requirements.txt中固定）
+    if not isinstance(getattr(arxiv_client, "_session", None), requests.Session):
+        raise RuntimeError("当前arxiv库版本没有 arxiv.Client._session，无法复用全局HTTP会话；请安装requirements.txt中固定的版本")
+    arxiv_client._session = get_http_session()
+    arxiv_searcher = arxiv.Search(
+        query=search_query,
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.SubmittedDate
+    )
+    
+    papers = []
+    # 结果按页懒加载：到达水位线后停止迭代，不再请求后续页面
+    for paper in arxiv_client.results(arxiv_searcher):
+        if watermark and is_at_or_below_watermark(paper, watermark):
+            return papers
+        papers.append(paper)
+    if watermark and len(papers) >= max_results:
+        logging.warning(f"新论文数量达到上限 {max_results}，未能追平水位线，可能遗漏更早的论文（搜索关键词：{search_query}）")
+    return papers
+
+
+@_run_metrics.timed("pwc_request")
+def fetch_paper_code_url(clean_paper_id: str) -> str | None:
+    """
+    请求PapersWithCode API，获取论文的官方代码仓库链接
+    
+    瞬时错误自动重试，PapersWithCode连续失败后熔断（见 request_with_retries）
+    Args:
+        clean_paper_id: 不含版本号的论文ID（如 "2108.09112"）
+    Returns:
+        官方代码仓库链接（若有）；否则返回None
+    Raises:
+        requests.RequestException / ValueError: 请求失败或响应无法解析时抛出，由调用方处理
+    """
+    papers_with_code_api = f"{PAPERS_WITH_CODE_BASE_URL}{clean_paper_id}"
+    
+    response = request_with_retries("GET", papers_with_code_api)
+    response.raise_for_status()
+    pwc_data = response.json()
+    
+    # 若有官方代码链接，直接使用
+    if "official" in pwc_data and pwc_data["official"]:
+        return pwc_data["official"]["url"]
+    return None
+
+
+def lookup_code_url(clean_paper_id: str) -> str | None:
+    """
+    获取论文代码链接：优先读取本地缓存（含PapersWithCode离线数据索引），未命中（或「无代码」结果已过期）时
+    请求PapersWithCode并写入缓存
+    
+    Args:
+        clean_paper_id: 不含版本号的论文ID
+    Returns:
+        官方代码仓库链接（若有）；否则返回None
+    Raises:
+        与 fetch_paper_code_url 相同；请求失败的结果不会写入缓存
+    """
+    cache = _code_link_cache
+    if cache is not None:
+        hit, code_url = cache.get(clean_paper_id)
+        _run_metrics.count("code_link_cache_hits" if hit else "code_link_cache_misses")
+        if hit:
+            return code_url
+    
+    code_url = fetch_paper_code_url(clean_paper_id)
+    if cache is not None:
+        cache.put(clean_paper_id, code_url)
+    return code_url
+
+
+def try_resolve_code_links(clean_paper_ids: list[str],
+                           max_workers: int = 1) -> dict[str, tuple[str | None, Exception | None]]:
+    """
+    并发获取一批论文的代码链接（线程池大小受 max_workers 限制，单主机并发受 _host_limiter 限制），
+    同时返回每篇论文的错误，由调用方决定如何处理（不放入延后队列）
+    
+    Args:
+        clean_paper_ids: 不含版本号的论文ID列表
+        max_workers: 线程池大小
+    Returns:
+        字典：key为论文ID，value为 (代码链接, 错误)；查询成功时错误为None，失败时代码链接为None
+    """
+    def resolve_one(clean_paper_id: str) -> tuple[str | None, Exception | None]:
+        """辅助函数：获取单篇论文的代码链接，失败时记录日志并返回错误"""
+        try:
+            return lookup_code_url(clean_paper_id), None
+        except CircuitOpenError as e:
+            # 主机已熔断：不再逐篇记录错误
+            return None, e
+        except Exception as e:
+            logging.error(f"PapersWithCode API请求失败（论文ID：{clean_paper_id}），错误：{e}")
+            _run_metrics.count("code_link_errors")
+            return None, e
+    
+    unique_ids = list(dict.fromkeys(clean_paper_ids))  # 去重并保持顺序
+    if not unique_ids:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_ids)))) as executor:
+        results = executor.map(resolve_one, unique_ids)
+        return dict(zip(unique_ids, results))
+
+
+def resolve_code_links(clean_paper_ids: list[str], max_workers: int = 1) -> dict[str, str | None]:
+    """
+    并发获取一批论文的代码链接（见 try_resolve_code_links）
+    
+    Args:
+        clean_paper_ids: 不含版本号的论文ID列表
+        max_workers: 线程池大小
+    Returns:
+        字典：key为论文ID，value为代码链接（请求失败或无代码时为None；瞬时错误失败的论文放入 _deferred_enrichment）
+    """
+    code_urls = {}
+    for clean_paper_id, (code_url, error) in try_resolve_code_links(clean_paper_ids, max_workers).items():
+        if error is not None and is_transient_error(error):
+            # 熔断时并未发出请求，不计入失败次数
+            _deferred_enrichment.add(clean_paper_id, str(error), failed=not isinstance(error, CircuitOpenError))
+        code_urls[clean_paper_id] = code_url
+    return code_urls
+
+
+def resolve_github_code_links(clean_paper_ids: list[str],
+                              batch_size: int = DEFAULT_GITHUB_BATCH_SIZE) -> dict[str, str]:
+    """
+    GitHub备用搜索：为PapersWithCode没有代码的论文批量搜索GitHub上的相关仓库（结果写入代码链接缓存）
+    
+    找到的仓库只是README中提到该论文的仓库，不一定是官方代码：存入 PaperRecord.github_url 并单独渲染，
+    不写入 code_url，之后PapersWithCode查到的官方代码链接优先显示
+    
+    设置了环境变量 GITHUB_TOKEN 时每次GraphQL请求合并 batch_size 篇论文，否则每次REST搜索合并
+    至多 GITHUB_SEARCH_MAX_OR_TERMS 篇；请求经 _rate_limiter 按搜索接口限速。
+    瞬时错误失败、因熔断未搜索或REST搜索结果无法归属的论文放入 _deferred_github_search，
+    由之后的运行重新搜索（见 drain_deferred_enrichment）；搜索完成（或命中缓存、遇到不可重试错误）的论文移出该队列
+    Args:
+        clean_paper_ids: 不含版本号的论文ID列表
+        batch_size: GraphQL请求每批的论文数
+    Returns:
+        字典：key为论文ID，value为仓库链接（只包含找到仓库的论文）
+    """
+    token = os.environ.get("GITHUB_TOKEN")
+    batch_size = max(1, batch_size if token else min(batch_size, GITHUB_SEARCH_MAX_OR_TERMS))
+    
+    code_urls = {}
+    due_ids = []
+    finished_ids = []
+    for clean_paper_id in dict.fromkeys(clean_paper_ids):  # 去重并保持顺序
+        hit, code_url = _code_link_cache.get_github(clean_paper_id) if _code_link_cache else (False, None)
+        if not hit:
+            due_ids.append(clean_paper_id)
+            continue
+        finished_ids.append(clean_paper_id)
+        if code_url:
+            code_urls[clean_paper_id] = code_url
+    
+    for start in range(0, len(due_ids), batch_size):
+        batch_ids = due_ids[start:start + batch_size]
+        try:
+            if token:
+                batch_urls = search_github_code_graphql(batch_ids, token)
+            else:
+                batch_urls = search_github_code(batch_ids)
+        except CircuitOpenError as e:
+            # GitHub已熔断：剩余论文本次不再搜索，延后（未发出请求，不计入失败次数）
+            for clean_paper_id in due_ids[start:]:
+                _deferred_github_search.add(clean_paper_id, str(e), failed=False)
+            break
+        except Exception as e:
+            logging.error(f"GitHub代码搜索失败（论文ID：{', '.join(batch_ids)}），错误：{e}")
+            _run_metrics.count("github_search_errors")
+            if is_transient_error(e):
+                for clean_paper_id in batch_ids:
+                    _deferred_github_search.add(clean_paper_id, str(e))
+            else:
+                finished_ids.extend(batch_ids)
+            continue
+        for clean_paper_id in batch_ids:
+            if clean_paper_id not in batch_urls:
+                # 结果无法归属：延后逐篇搜索（未发生请求失败，不计入失败次数）
+                _deferred_github_search.add(clean_paper_id, "搜索结果无法归属到论文", failed=False)
+                _run_metrics.count("github_search_ambiguous")
+        finished_ids.extend(batch_urls)
+        for clean_paper_id, code_url in batch_urls.items():
+            if _code_link_cache is not None:
+                _code_link_cache.put_github(clean_paper_id, code_url)
+            if code_url:
+                code_urls[clean_paper_id] = code_url
+    
+    _deferred_github_search.discard(finished_ids)
+    _run_metrics.count("github_fallback_hits", len(code_urls))
+    return code_urls
+
+
+def ingest_pwc_dump(dump_path: str) -> int:
+    """
+    流式读取PapersWithCode离线数据（links-between-papers-and-code.json.gz），将其中的官方代码链接
+    导入代码链接缓存的本地索引；之后 lookup_code_url 优先查询该索引，命中时不再请求API
+    
+    Args:
+        dump_path: 离线数据文件路径（.json.gz 或未压缩的 .json）
+    Returns:
+        导入的论文数
+    Raises:
+        RuntimeError: 未配置代码链接缓存（pwc_cache_path）时抛出
+    """
+    if _code_link_cache is None:
+        raise RuntimeError("导入PapersWithCode离线数据需要先配置代码链接缓存（pwc_cache_path）")
+    
+    def official_links(dump_file):
+        """辅助函数：逐条产出离线数据中带arXiv ID的官方代码链接"""
+        for link in iter_json_array(dump_file):
+            arxiv_id = link.get("paper_arxiv_id")
+            if arxiv_id and link.get("is_official") and link.get("repo_url"):
+                yield get_clean_paper_id(arxiv_id.strip()), link["repo_url"]
+    
+    open_dump = gzip.open if dump_path.endswith(".gz") else open
+    with open_dump(dump_path, "rt", encoding="utf-8") as dump_file:
+        count = _code_link_cache.replace_dump_links(official_links(dump_file))
+    logging.info(f"已从 {dump_path} 导入 {count} 篇论文的官方代码链接")
+    return count
+
+
+# -------------------------- 论文库读写（单一数据源，README/GitPage/微信均由其渲染） --------------------------
+@dataclass(slots=True)
+class PaperRecord:
+    """结构化论文记录（论文库中存储的最小单元，Markdown仅在输出时渲染）"""
+    id: str                                   # 不含版本号的论文ID（如 "2108.09112"）
+    title: str
+    authors: list[str] = field(default_factory=list)
+    version: int = 1                          # arXiv版本号（如 "2108.09112v2" 为2）
+    published: str | None = None              # 发表日期（"YYYY-MM-DD"）
+    updated: str | None = None                # 更新日期（"YYYY-MM-DD"）
+    category: str | None = None               # arXiv主要分类（如 "cs.CV"）
+    comment: str | None = None                # 论文备注（如页数、会议）
+    code_url: str | None = None               # 代码仓库链接
+    abstract: str | None = None               # 摘要（用于本地重新分类）
+    github_url: str | None = None             # GitHub备用搜索找到的相关仓库（非官方，仅在没有代码链接时显示）
+    
+    @property
+    def first_author(self) -> str:
+        """第一作者，格式同 format_authors(only_first_author=True)"""
+        return f"{self.authors[0]} et.al." if self.authors else "Unknown Author"
+    
+    def to_dict(self) -> dict:
+        """转换为可JSON序列化的字典（省略值为None的字段，读取时由 from_dict 补回默认值）"""
+        return {f.name: value for f in fields(self) if (value := getattr(self, f.name)) is not None}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PaperRecord":
+        """由字典构造论文记录（忽略未知字段，兼容仅含 first_author/update_date 的早期记录）"""
+        known = {f.name for f in fields(cls)}
+        record = cls(**{key: value for key, value in data.items() if key in known})
+        if not record.authors and data.get("first_author"):
+            record.authors = [data["first_author"].removesuffix(" et.al.")]
+        if record.updated is None and data.get("update_date"):
+            record.updated = data["update_date"]
+        return record
+
+
+def render_table_row(record: PaperRecord) -> str:
+    """将论文记录渲染为Markdown表格行（用于README/GitPage）"""
+    clean_arxiv_url = f"{ARXIV_BASE_URL}abs/{record.id}"
+    if record.code_url:
+        code_cell = f"**[link]({record.code_url})**"
+    elif record.github_url:
+        code_cell = f"[related]({record.github_url})"  # 非官方：README中提到该论文的仓库
+    else:
+        code_cell = "null"
+    return (
+        f"|**{record.updated}**|**{record.title}**|{record.first_author}"
+        f"|[{record.id}]({clean_arxiv_url})|{code_cell}|\n"
+    )
+
+
+def render_list_item(record: PaperRecord) -> str:
+    """将论文记录渲染为Markdown列表项（用于微信推送）"""
+    clean_arxiv_url = f"{ARXIV_BASE_URL}abs/{record.id}"
+    list_item = (
+        f"- {record.updated}, **{record.title}**, {record.first_author}, "
+        f"Paper: [{clean_arxiv_url}]({clean_arxiv_url})"
+    )
+    if record.code_url:
+        list_item += f", Code: **[{record.code_url}]({record.code_url})**"
+    elif record.github_url:
+        list_item += f", Related repo: [{record.github_url}]({record.github_url})"
+    # 补充论文备注（若有）
+    if record.comment:
+        list_item += f", {record.comment}"
+    return list_item + "\n"
+
+
+def query_papers(paper_store: dict, topic: str | None = None, since: str | None = None,
+                 has_code: bool | None = None) -> list[PaperRecord]:
+    """
+    按条件查询论文库（同一论文出现在多个主题中时只返回一次）
+    
+    Args:
+        paper_store: 论文库字典（{主题: {论文ID: PaperRecord}}）
+        topic: 仅查询该主题；为None时查询所有主题
+        since: 仅返回更新日期不早于该日期（"YYYY-MM-DD"）的论文
+        has_code: True仅返回有代码的论文，False仅返回无代码的论文，None不限
+    Returns:
+        按论文ID倒序排列的论文记录列表
+    """
+    topics = [topic] if topic is not None else list(paper_store.keys())
+    matched = {}
+    for topic_name in topics:
+        for paper_id, record in paper_store.get(topic_name, {}).items():
+            if since is not None and (record.updated or "") < since:
+                continue
+            if has_code is not None and bool(record.code_url) != has_code:
+                continue
+            matched[paper_id] = record
+    return [matched[paper_id] for paper_id in sorted(matched, reverse=True)]
+
+
+# 旧版JSON中的Markdown表格行，例如：
+# |**2021-10-14**|**标题**|张三 et.al.|[2110.07546](http://arxiv.org/abs/2110.07546)|null|
+LEGACY_TABLE_ROW_PATTERN = re.compile(
+    r"^\|\*\*(?P<date>[^*]*)\*\*\|\*\*(?P<title>.*?)\*\*\|(?P<author>[^|]*)\|\[[^\]]*\]\([^)]*\)\|"
+    r"(?:null|\*\*\[link\]\((?P<code>[^)]*)\)\*\*)\|\s*$",
+    re.DOTALL
+)
+# 旧版微信JSON中的Markdown列表项，例如：
+# - 2022-01-19, **标题**, 张三 et.al., Paper: [url](url), Code: **[code](code)**, 备注
+LEGACY_LIST_ITEM_PATTERN = re.compile(
+    r"^- (?P<date>[^,]*), \*\*(?P<title>.*?)\*\*, (?P<author>.*?), Paper: \[[^\]]*\]\([^)]*\)"
+    r"(?:, Code: \*\*\[(?P<code>[^\]]*)\]\([^)]*\)\*\*)?(?:, (?P<comment>.*?))?\s*$",
+    re.DOTALL
+)
+
+
+def parse_legacy_markdown_row(clean_paper_id: str, markdown_row: str) -> PaperRecord | None:
+    """
+    将旧版JSON中的Markdown表格行/列表项解析为论文记录
+    
+    Args:
+        clean_paper_id: 不含版本号的论文ID
+        markdown_row: Markdown表格行或列表项
+    Returns:
+        论文记录；无法解析时返回None
+    """
+    for pattern in (LEGACY_TABLE_ROW_PATTERN, LEGACY_LIST_ITEM_PATTERN):
+        match = pattern.match(markdown_row)
+        if match:
+            return PaperRecord(
+                id=clean_paper_id,
+                title=match.group("title"),
+                authors=[match.group("author").removesuffix(" et.al.")],
+                updated=match.group("date"),
+                comment=match.groupdict().get("comment") or None,
+                code_url=match.group("code") or None
+            )
+    return None
+
+
+def migrate_legacy_json_stores(json_file_path: str, legacy_json_paths: list[str]) -> None:
+    """
+    若论文库文件不存在，则由旧版的三个JSON文件（README/GitPage/微信，值为Markdown字符串）合并生成
+    
+    同一论文在多个旧文件中出现时合并字段：代码链接、备注取非空值
+    Args:
+        json_file_path: 论文库JSON文件路径
+        legacy_json_paths: 旧版JSON文件路径列表
+    """
+    if os.path.exists(json_file_path):
+        return
+    
+    paper_store = {}
+    for legacy_path in legacy_json_paths:
+        if not os.path.exists(legacy_path):
+            continue
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            content = f.read()
+            legacy_data = json.loads(content) if content else {}
+        
+        for topic, papers in legacy_data.items():
+            topic_records = paper_store.setdefault(topic, {})
+            for paper_id, markdown_row in papers.items():
+                record = parse_legacy_markdown_row(paper_id, markdown_row)
+                if record is None:
+                    logging.warning(f"无法解析旧版论文数据（{legacy_path}，论文ID：{paper_id}），已跳过")
+                    continue
+                if paper_id in topic_records:
+                    existing = topic_records[paper_id]
+                    existing.code_url = existing.code_url or record.code_url
+                    existing.comment = existing.comment or record.comment
+                else:
+                    topic_records[paper_id] = record
+    
+    save_paper_store(json_file_path, paper_store)
+    logging.info(f"已由旧版JSON文件 {legacy_json_paths} 生成论文库 {json_file_path}")
+
+
+@_run_metrics.timed("load_paper_store")
+def load_paper_store(json_file_path: str) -> dict:
+    """
+    读取论文库
+    
+    Args:
+        json_file_path: 论文库JSON文件路径
+    Returns:
+        论文库字典：{主题: {论文ID: PaperRecord}}；文件不存在或为空时返回空字典
+    """
+    if not os.path.exists(json_file_path):
+        return {}
+    with open(json_file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+        raw_store = json.loads(content) if content else {}
+    _run_metrics.count("bytes_read", len(content.encode("utf-8")))
+    return {
+        topic: {paper_id: PaperRecord.from_dict(data) for paper_id, data in papers.items()}
+        for topic, papers in raw_store.items()
+    }
+
+
+@_run_metrics.timed("save_paper_store")
+def save_paper_store(json_file_path: str, paper_store: dict) -> None:
+    """将论文库写回JSON文件（紧凑格式，不缩进）"""
+    raw_store = {
+        topic: {paper_id: record.to_dict() for paper_id, record in papers.items()}
+        for topic, papers in paper_store.items()
+    }
+    write_text_if_changed(json_file_path, json.dumps(raw_store, separators=(",", ":")))
+
+
+def load_crawl_state(state_file_path: str) -> dict:
+    """
+    读取增量爬取状态
+    
+    Args:
+        state_file_path: 状态文件路径
+    Returns:
+        {主题: 水位线}；文件不存在或为空时返回空字典
+    """
+    if not os.path.exists(state_file_path):
+        return {}
+    with open(state_file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+        return json.loads(content) if content else {}
+
+
+def save_crawl_state(state_file_path: str, crawl_state: dict) -> None:
+    """写回增量爬取状态"""
+    write_text_if_changed(state_file_path, json.dumps(crawl_state, indent=2))
+
+
+class JsonPaperStore:
+    """论文库JSON后端：整库读取、整库写回"""
+    
+    def __init__(self, json_file_path: str):
+        self.json_file_path = json_file_path
+    
+    def load(self) -> dict:
+        """读取论文库：{主题: {论文ID: PaperRecord}}"""
+        return load_paper_store(self.json_file_path)
+    
+    def save(self, paper_store: dict, changed_records: list[tuple[str, PaperRecord]]) -> None:
+        """写回论文库（JSON无法局部更新，有变化时整库重写；内容与原文件相同时不写入）"""
+        if changed_records:
+            save_paper_store(self.json_file_path, paper_store)
+
+
+class JournalPaperStore:
+    """
+    论文库JSONL日志后端：快照（论文库JSON文件）+ 只追加的变更日志（每行一条新增/更新的论文记录）
+    
+    每次写入只追加变化的记录，写入量与当日增量成正比；日志超过大小阈值或到达压缩日时，
+    将日志合并进快照并清空日志
+    """
+    
+    def __init__(self, snapshot_path: str, journal_path: str, compact_threshold_bytes: int = 0,
+                 compact_day: int = 0):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_threshold_bytes = compact_threshold_bytes  # 日志超过该大小时压缩；0表示不按大小压缩
+        self.compact_day = compact_day  # 每月该日压缩；0表示不按日期压缩
+    
+    def load(self) -> dict:
+        """读取论文库：先读快照，再按顺序重放日志中的记录"""
+        paper_store = load_paper_store(self.snapshot_path)
+        if not os.path.exists(self.journal_path):
+            return paper_store
+        replayed = 0
+        _run_metrics.count("bytes_read", os.path.getsize(self.journal_path))
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 上次写入中断留下的不完整行：丢弃（对应的记录会在下次爬取/更新时重新写入）
+                    logging.warning(f"跳过论文库日志 {self.journal_path} 第 {line_number} 行：格式错误")
+                    continue
+                paper_store.setdefault(entry["topic"], {})[entry["record"]["id"]] = PaperRecord.from_dict(entry["record"])
+                replayed += 1
+        logging.info(f"论文库日志：重放 {replayed} 条记录（{self.journal_path}）")
+        return paper_store
+    
+    def save(self, paper_store: dict, changed_records: list[tuple[str, PaperRecord]]) -> None:
+        """将变化的记录追加到日志；满足压缩条件时将日志合并进快照"""
+        if changed_records:
+            journal_dir = os.path.dirname(self.journal_path)
+            if journal_dir:
+                os.makedirs(journal_dir, exist_ok=True)
+            journal_lines = [
+                json.dumps({"topic": topic, "record": record.to_dict()}) + "\n"
+                for topic, record in changed_records
+            ]
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(journal_lines)
+            _run_metrics.count("bytes_written", sum(len(line.encode("utf-8")) for line in journal_lines))
+        if self.should_compact():
+            self.compact(paper_store)
+    
+    def should_compact(self) -> bool:
+        """日志非空，且超过大小阈值或今天是压缩日"""
+        if not os.path.exists(self.journal_path):
+            return False
+        journal_size = os.path.getsize(self.journal_path)
+        if journal_size == 0:
+            return False
+        if self.compact_threshold_bytes > 0 and journal_size >= self.compact_threshold_bytes:
+            return True
+        return self.compact_day > 0 and datetime.date.today().day == self.compact_day
+    
+    def compact(self, paper_store: dict) -> None:
+        """将完整论文库写入快照后删除日志（先写快照再删日志，中途失败时重放日志仍能得到相同结果）"""
+        save_paper_store(self.snapshot_path, paper_store)
+        os.remove(self.journal_path)
+        logging.info(f"论文库日志已合并进快照 {self.snapshot_path}")
+
+
+class SqlitePaperStore:
+    """
+    论文库SQLite后端：papers表存论文记录，paper_topics表存「主题-论文」归属
+    
+    新增/更新论文时只upsert变化的记录，写入量与当日增量成正比，而非与历史总量成正比
+    """
+    
+    def __init__(self, db_path: str):
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 1,
+                title TEXT NOT NULL,
+                authors TEXT NOT NULL,
+                published TEXT,
+                updated TEXT,
+                category TEXT,
+                comment TEXT,
+                code_url TEXT,
+                abstract TEXT,
+                github_url TEXT
+            );
+            CREATE TABLE IF NOT EXISTS paper_topics (
+                topic TEXT NOT NULL,
+                paper_id TEXT NOT NULL REFERENCES papers(id),
+                PRIMARY KEY (topic, paper_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_papers_updated ON papers(updated);
+            CREATE INDEX IF NOT EXISTS idx_paper_topics_paper_id ON paper_topics(paper_id);
+            """
+        )
+        # 兼容早期创建的数据库：补充后来新增的列
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(papers)")}
+        if "abstract" not in columns:
+            self._conn.execute("ALTER TABLE papers ADD COLUMN abstract TEXT")
+        if "github_url" not in columns:
+            self._conn.execute("ALTER TABLE papers ADD COLUMN github_url TEXT")
+    
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM papers LIMIT 1").fetchone() is None
+    
+    def load(self) -> dict:
+        """读取论文库：{主题: {论文ID: PaperRecord}}；同一论文在多个主题中共享同一个记录对象"""
+        records = {}
+        for row in self._conn.execute(
+            "SELECT id, version, title, authors, published, updated, category, comment, code_url, abstract, github_url "
+            "FROM papers"
+        ):
+            records[row[0]] = PaperRecord(
+                id=row[0], version=row[1], title=row[2], authors=json.loads(row[3]),
+                published=row[4], updated=row[5], category=row[6], comment=row[7], code_url=row[8],
+                abstract=row[9], github_url=row[10]
+            )
+        
+        paper_store = {}
+        # 按写入顺序返回主题，与JSON后端的主题顺序保持一致
+        for topic, paper_id in self._conn.execute("SELECT topic, paper_id FROM paper_topics ORDER BY rowid"):
+            paper_store.setdefault(topic, {})[paper_id] = records[paper_id]
+        return paper_store
     
-    return formatted_filter
+    def save(self, paper_store: dict, changed_records: list[tuple[str, PaperRecord]]) -> None:
+        """只upsert发生变化的论文记录及其主题归属（paper_store 仅为与JSON后端保持接口一致）"""
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO papers (id, version, title, authors, published, updated, category, comment, code_url, abstract,
+                                    github_url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    version = excluded.version, title = excluded.title, authors = excluded.authors,
+                    published = excluded.published, updated = excluded.updated, category = excluded.category,
+                    comment = excluded.comment, code_url = excluded.code_url, abstract = excluded.abstract,
+                    github_url = excluded.github_url
+                """,
+                [
+                    (record.id, record.version, record.title, json.dumps(record.authors), record.published,
+                     record.updated, record.category, record.comment, record.code_url, record.abstract,
+                     record.github_url)
+                    for _, record in changed_records
+                ]
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO paper_topics (topic, paper_id) VALUES (?, ?)",
+                [(topic, record.id) for topic, record in changed_records]
+            )
+    
+    def close(self) -> None:
+        self._conn.close()
 
 
-def process_config_keywords(config: dict) -> dict:
+PaperStoreBackend = JsonPaperStore | JournalPaperStore | SqlitePaperStore
+
+
+def open_paper_store(config: dict) -> PaperStoreBackend:
     """
-    处理配置文件中的关键词，将每个主题对应的过滤器格式化为搜索字符串
+    根据配置项 storage_backend（json / jsonl / sqlite）打开论文库
     
+    - 论文库JSON文件不存在时，先由旧版JSON文件（legacy_json_paths）迁移生成
+    - 使用SQLite后端且数据库为空时，从论文库JSON文件导入全部论文
     Args:
-        config: 原始配置字典，需包含 "keywords" 字段（例如 {"SLAM": {"filters": ["SLAM", "3D"]}}）
+        config: 完整配置字典
     Returns:
-        新增 "formatted_keywords" 字段的配置字典，存储格式化后的搜索词
+        JsonPaperStore 或 SqlitePaperStore
     """
-    formatted_keywords = {}
-    # 遍历每个主题（如"SLAM"）及其对应的过滤器列表
-    for topic, topic_config in config["keywords"].items():
-        formatted_keywords[topic] = parse_filter_keywords(topic_config["filters"])
+    json_store_path = config["json_store_path"]
+    migrate_legacy_json_stores(json_store_path, config.get("legacy_json_paths", []))
     
-    return formatted_keywords
+    backend = config.get("storage_backend", "json")
+    if backend == "json":
+        return JsonPaperStore(json_store_path)
+    if backend == "jsonl":
+        return JournalPaperStore(
+            json_store_path,
+            config["journal_path"],
+            compact_threshold_bytes=int(config.get("journal_compact_bytes", 0)),
+            compact_day=int(config.get("journal_compact_day", 0))
+        )
+    if backend != "sqlite":
+        raise ValueError(f"未知的论文库后端：{backend}（可选：json、jsonl、sqlite）")
+    
+    sqlite_store = SqlitePaperStore(config["sqlite_store_path"])
+    if sqlite_store.is_empty():
+        json_store = load_paper_store(json_store_path)
+        sqlite_store.save(json_store, [
+            (topic, record) for topic, papers in json_store.items() for record in papers.values()
+        ])
+        logging.info(f"已将论文库 {json_store_path} 导入SQLite数据库 {config['sqlite_store_path']}")
+    return sqlite_store
 
 
-def load_config(config_file_path: str) -> dict:
+def build_paper_record(paper: arxiv.Result, code_urls: dict[str, str | None],
+                       github_urls: dict[str, str] | None = None) -> PaperRecord:
     """
-    加载YAML配置文件，并处理关键词过滤器
+    由arXiv搜索结果构造论文记录
     
     Args:
-        config_file_path: 配置文件路径（如 "config.yaml"）
+        paper: arxiv.Result 对象
+        code_urls: 已批量获取的代码链接（key为不含版本号的论文ID）
+        github_urls: GitHub备用搜索找到的相关仓库（key为不含版本号的论文ID，见 resolve_github_code_links）
     Returns:
-        完整配置字典，包含原始配置 + 格式化后的关键词（formatted_keywords字段）
+        PaperRecord
     """
-    # 读取YAML配置文件
-    with open(config_file_path, "r", encoding="utf-8") as f:
-        config = yaml.load(f, Loader=yaml.FullLoader)
+    # -------------------------- 1. 提取论文基础信息 --------------------------
+    raw_paper_id = paper.get_short_id()  # 原始ID（含版本，如 "2108.09112v1"）
+    paper_title = paper.title
+    first_author = format_authors(paper.authors, only_first_author=True)  # 第一作者
+    update_date = paper.updated.date()  # 更新日期
     
-    # 处理关键词过滤器，添加到配置中
-    config["formatted_keywords"] = process_config_keywords(config)
+    logging.info(f"发现论文：{update_date} | {paper_title} | 作者：{first_author}")
     
-    logging.info(f"成功加载配置：{config}")
-    return config
+    # -------------------------- 2. 处理论文ID（去除版本号，如 "v1"） --------------------------
+    clean_paper_id = get_clean_paper_id(raw_paper_id)
+    version_match = re.search(r"v(\d+)$", raw_paper_id)
+    
+    # -------------------------- 3. 构造论文记录 --------------------------
+    return PaperRecord(
+        id=clean_paper_id,
+        title=paper_title,
+        authors=[str(author) for author in paper.authors],
+        version=int(version_match.group(1)) if version_match else 1,
+        published=str(paper.published.date()),
+        updated=str(update_date),
+        category=paper.primary_category,
+        comment=paper.comment or None,  # 论文备注（如页数、会议）
+        code_url=code_urls.get(clean_paper_id),
+        abstract=paper.summary.replace("\n", " "),  # 摘要（去除换行）
+        github_url=(github_urls or {}).get(clean_paper_id)
+    )
 
 
-def format_authors(authors: list, only_first_author: bool = False) -> str:
+# -------------------------- 关键词匹配（本地主题分类，Aho-Corasick多模式匹配） --------------------------
+class KeywordMatcher:
     """
-    格式化论文作者列表，支持返回「第一作者」或「所有作者」
+    多模式关键词匹配器：由所有主题的过滤器一次性构建Aho-Corasick自动机，
+    每篇文本只需扫描一遍即可得到全部命中的主题
     
-    Args:
-        authors: arxiv库返回的作者对象列表
-        only_first_author: 若为True，仅返回第一作者；否则返回所有作者（逗号分隔）
-    Returns:
-        格式化后的作者字符串，例如 "张三 et.al." 或 "张三, 李四, 王五"
+    匹配规则：不区分大小写，按完整单词/短语匹配；非字母数字字符（空白、连字符、标点）
+    均视为单词分隔，例如 "Structure from Motion" 可匹配 "structure-from-motion"
     """
-    # 转换作者对象为字符串（arxiv.Author对象的__str__为姓名）
-    author_names = [str(author) for author in authors]
     
-    if only_first_author:
-        # 仅返回第一作者，后面加 "et.al." 表示等作者
-        return f"{author_names[0]} et.al." if author_names else "Unknown Author"
-    else:
-        # 返回所有作者，用逗号分隔
-        return ", ".join(author_names) if author_names else "Unknown Authors"
+    def __init__(self, keywords: dict):
+        """
+        Args:
+            keywords: 配置中的 "keywords" 字段（例如 {"SLAM": {"filters": ["SLAM", "Visual Odometry"]}}）
+        """
+        self.topics = list(keywords.keys())
+        self._goto = [{}]      # 状态转移表：状态 -> {字符: 下一状态}
+        self._outputs = [set()]  # 每个状态命中的主题
+        self._fail = [0]
+        
+        for topic, topic_config in keywords.items():
+            for filter_word in topic_config["filters"]:
+                pattern = self.normalize(filter_word)
+                if pattern.strip():
+                    self._add_pattern(pattern, topic)
+        self._build_fail_links()
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """统一为小写，非字母数字字符折叠为单个空格，首尾补空格以实现按完整单词匹配"""
+        return " " + " ".join(re.split(r"[\W_]+", text.lower())).strip() + " "
+    
+    def _add_pattern(self, pattern: str, topic: str) -> None:
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._outputs.append(set())
+                self._fail.append(0)
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._outputs[state].add(topic)
+    
+    def _build_fail_links(self) -> None:
+        # 广度优先遍历，为每个状态计算失配指针，并合并失配链上的命中主题
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                fallback = self._goto[fail_state].get(char, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                self._outputs[next_state] |= self._outputs[self._fail[next_state]]
+    
+    def match(self, text: str) -> list[str]:
+        """
+        扫描文本，返回命中的主题（按配置顺序）
+        
+        Args:
+            text: 待分类文本（如标题 + 摘要）
+        Returns:
+            命中的主题列表
+        """
+        matched = set()
+        state = 0
+        for char in self.normalize(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._outputs[state]:
+                matched |= self._outputs[state]
+        return [topic for topic in self.topics if topic in matched]
 
 
-def sort_papers_by_id_desc(papers: dict) -> dict:
+def classify_paper_topics(title: str, abstract: str | None, matcher: KeywordMatcher) -> list[str]:
     """
-    按论文ID倒序排序（论文ID含时间信息，倒序即最新的在前）
+    根据标题和摘要判断论文所属主题（可属于多个主题）
     
     Args:
-        papers: 论文字典，key为论文ID（如 "2108.09112"），value为论文信息字符串
+        title: 论文标题
+        abstract: 论文摘要（可为空）
+        matcher: 由配置关键词构建的 KeywordMatcher
     Returns:
-        按论文ID倒序排列后的新字典
+        匹配到的主题列表（按配置顺序）
     """
-    sorted_paper_ids = sorted(papers.keys(), reverse=True)
-    return {paper_id: papers[paper_id] for paper_id in sorted_paper_ids}
+    return matcher.match(f"{title}\n{abstract or ''}")
 
 
-def search_github_code(query: str) -> str | None:
+@_run_metrics.timed("retag_paper_store")
+def retag_paper_store(paper_store_backend: PaperStoreBackend, keywords: dict) -> dict:
     """
-    搜索GitHub仓库，获取与论文相关的代码链接（按星数排序取Top1）
+    用当前配置的过滤器对论文库中的全部论文重新分类（新增过滤器或主题后无需重新爬取）
     
+    只为论文补充新命中的主题，不移除已有的主题归属（历史论文由arXiv服务端检索归类，
+    其命中范围比标题+摘要更广）
     Args:
-        query: 搜索关键词（如论文标题、论文ID）
+        paper_store_backend: 论文库后端（见 open_paper_store）
+        keywords: 配置中的 "keywords" 字段
     Returns:
-        仓库HTML链接（若找到）；否则返回None
+        更新后的论文库字典
     """
-    # 构造GitHub搜索参数：按星数降序，优先找高星仓库
-    params = {
-        "q": query,
-        "sort": "stars",
-        "order": "desc"
-    }
+    paper_store = paper_store_backend.load()
+    matcher = KeywordMatcher(keywords)
     
-    try:
-        # 发送GET请求到GitHub API
-        response = requests.get(GITHUB_SEARCH_URL, params=params)
-        response.raise_for_status()  # 若请求失败（如404/500），抛出异常
-        search_results = response.json()
-        
-        # 若有搜索结果，返回第一个仓库的链接
-        if search_results["total_count"] > 0:
-            return search_results["items"][0]["html_url"]
-        return None
+    # 同一论文可能出现在多个主题中，只分类一次
+    unique_records = {}
+    for papers in paper_store.values():
+        for paper_id, record in papers.items():
+            unique_records.setdefault(paper_id, record)
     
-    except Exception as e:
-        logging.error(f"GitHub代码搜索失败（关键词：{query}），错误：{e}")
-        return None
+    changed_records = []
+    for paper_id, record in unique_records.items():
+        for topic in classify_paper_topics(record.title, record.abstract, matcher):
+            topic_papers = paper_store.setdefault(topic, {})
+            if paper_id not in topic_papers:
+                topic_papers[paper_id] = record
+                changed_records.append((topic, record))
+    
+    logging.info(f"重新分类完成：共 {len(unique_records)} 篇论文，新增 {len(changed_records)} 条主题归属")
+    paper_store_backend.save(paper_store, changed_records)
+    return paper_store
 
 
 # -------------------------- 核心逻辑函数（论文爬取、数据更新、格式转换） --------------------------
-def fetch_daily_arxiv_papers(topic: str, search_query: str, max_results: int = 2) -> tuple[dict, dict]:
+@_run_metrics.timed("fetch_daily_arxiv_papers")
+def fetch_daily_arxiv_papers(topic: str, search_query: str, max_results: int = 2,
+                             enrich_concurrency: int = 1, watermark: dict | None = None,
+                             max_crawl_results: int | None = None,
+                             github_batch_size: int = 0) -> tuple[dict, dict | None]:
     """
     从arXiv爬取指定主题的最新论文，获取论文基本信息及代码链接
     
+    先完成arXiv检索并收集论文ID，再并发请求PapersWithCode获取代码链接，
+    最后按arXiv返回顺序构造论文记录
     Args:
         topic: 论文主题（如 "SLAM"）
         search_query: 格式化后的arXiv搜索关键词
-        max_results: 最多爬取的论文数量
+        max_results: 最多爬取的论文数量（同时作为每页请求数量）
+        enrich_concurrency: 并发获取代码链接的线程数
+        watermark: 该主题上次爬取到的最新论文；给定时只爬取比它更新的论文
+        max_crawl_results: 给定水位线时最多爬取的论文数量（默认同 max_results）
+        github_batch_size: GitHub备用搜索每批的论文数（0表示不启用，见 resolve_github_code_links）
     Returns:
-        两个字典：
-        1. markdown_table_data: 用于生成表格的论文数据（key=论文ID，value=Markdown表格行）
-        2. markdown_list_data: 用于生成列表的论文数据（key=论文ID，value=Markdown列表项）
+        两个值：
+        1. {topic: {论文ID: PaperRecord}}
+        2. 本次爬取到的最新论文水位线（无新论文时沿用传入的水位线）
     """
-    markdown_table_data = {}  # 用于README/GitPage的表格格式
-    markdown_list_data = {}   # 用于微信推送的列表格式
+    paper_records = {}
     
-    # 初始化arXiv搜索器：按提交日期排序（最新的在前）
-    arxiv_searcher = arxiv.Search(
-        query=search_query,
-        max_results=max_results,
-        sort_by=arxiv.SortCriterion.SubmittedDate
+    # 搜索结果按提交日期排序（最新的在前）；有水位线时逐页爬取直到追平水位线
+    papers = fetch_arxiv_results(
+        search_query,
+        max_results=(max_crawl_results or max_results) if watermark else max_results,
+        watermark=watermark,
+        page_size=max_results
     )
+    new_watermark = get_paper_watermark(papers[0]) if papers else watermark
     
-    # 遍历搜索结果，提取每篇论文的信息
-    for paper in arxiv_searcher.results():
-        # -------------------------- 1. 提取论文基础信息 --------------------------
-        raw_paper_id = paper.get_short_id()  # 原始ID（含版本，如 "2108.09112v1"）
-        paper_title = paper.title
-        paper_arxiv_url = paper.entry_id  # 原始arXiv链接
-        paper_abstract = paper.summary.replace("\n", " ")  # 摘要（去除换行）
-        all_authors = format_authors(paper.authors)  # 所有作者
-        first_author = format_authors(paper.authors, only_first_author=True)  # 第一作者
-        primary_category = paper.primary_category  # 主要分类
-        publish_date = paper.published.date()  # 发表日期
-        update_date = paper.updated.date()  # 更新日期
-        paper_comments = paper.comment  # 论文备注（如页数、会议）
-        
-        logging.info(f"发现论文：{update_date} | {paper_title} | 作者：{first_author}")
-        
-        # -------------------------- 2. 处理论文ID（去除版本号，如 "v1"） --------------------------
-        version_pos = raw_paper_id.find("v")  # 查找版本号起始位置
-        clean_paper_id = raw_paper_id[:version_pos] if version_pos != -1 else raw_paper_id
-        clean_arxiv_url = f"{ARXIV_BASE_URL}abs/{clean_paper_id}"  # 纯净的论文详情页链接
-        
-        # -------------------------- 3. 尝试获取代码链接（优先PapersWithCode，备用GitHub） --------------------------
-        code_url = None
-        # 1. 先请求PapersWithCode API（官方代码链接更可靠）
-        papers_with_code_api = f"{PAPERS_WITH_CODE_BASE_URL}{clean_paper_id}"
-        
-        try:
-            response = requests.get(papers_with_code_api)
-            response.raise_for_status()
-            pwc_data = response.json()
-            
-            # 若有官方代码链接，直接使用
-            if "official" in pwc_data and pwc_data["official"]:
-                code_url = pwc_data["official"]["url"]
-            
-            # TODO：原代码预留的备用逻辑（PapersWithCode无结果时搜GitHub）
-            # elif code_url is None:
-            #     code_url = search_github_code(paper_title)
-            #     if code_url is None:
-            #         code_url = search_github_code(clean_paper_id)
-        
-        except Exception as e:
-            logging.error(f"PapersWithCode API请求失败（论文ID：{clean_paper_id}），错误：{e}")
-        
-        # -------------------------- 4. 构造Markdown格式的数据 --------------------------
-        # 表格格式（用于README/GitPage）
-        if code_url:
-            table_row = (
-                f"|**{update_date}**|**{paper_title}**|{first_author}|[{clean_paper_id}]({clean_arxiv_url})|**[link]({code_url})**|\n"
-            )
-        else:
-            table_row = (
-                f"|**{update_date}**|**{paper_title}**|{first_author}|[{clean_paper_id}]({clean_arxiv_url})|null|\n"
-            )
-        markdown_table_data[clean_paper_id] = table_row
-        
-        # 列表格式（用于微信推送）
-        if code_url:
-            list_item = (
-                f"- {update_date}, **{paper_title}**, {first_author}, Paper: [{clean_arxiv_url}]({clean_arxiv_url}), Code: **[{code_url}]({code_url})**"
-            )
-        else:
-            list_item = (
-                f"- {update_date}, **{paper_title}**, {first_author}, Paper: [{clean_arxiv_url}]({clean_arxiv_url})"
-            )
-        # 补充论文备注（若有）
-        if paper_comments:
-            list_item += f", {paper_comments}\n"
+    # 先收集所有论文ID，再批量并发获取代码链接（优先PapersWithCode，官方代码链接更可靠）
+    code_urls = resolve_code_links(
+        [get_clean_paper_id(paper.get_short_id()) for paper in papers],
+        max_workers=enrich_concurrency
+    )
+    # PapersWithCode无结果的论文：批量搜索GitHub（结果单独保存，不作为官方代码链接）
+    github_urls = {}
+    if github_batch_size:
+        github_urls = resolve_github_code_links(
+            [clean_paper_id for clean_paper_id, code_url in code_urls.items() if not code_url], github_batch_size
+        )
+    
+    # 按arXiv返回顺序，构造每篇论文的记录（代码链接已在上方批量获取）
+    for paper in papers:
+        record = build_paper_record(paper, code_urls, github_urls)
+        paper_records[record.id] = record
+    
+    return {topic: paper_records}, new_watermark
+
+
+@_run_metrics.timed("fetch_combined_arxiv_papers")
+def fetch_combined_arxiv_papers(keywords: dict, formatted_keywords: dict, max_results: int = 2,
+                                enrich_concurrency: int = 1, watermark: dict | None = None,
+                                max_crawl_results: int | None = None,
+                                categories: list[str] | None = None,
+                                github_batch_size: int = 0) -> tuple[list[dict], dict | None]:
+    """
+    合并爬取：所有主题只发送一次arXiv检索（各主题关键词取并集），再在本地按过滤器把论文分配到主题
+    
+    同时属于多个主题的论文只下载、只获取代码链接一次
+    Args:
+        keywords: 配置中的 "keywords" 字段（本地分类使用其中的 filters）
+        formatted_keywords: 各主题格式化后的arXiv搜索关键词
+        max_results: 每个主题最多爬取的论文数量（合并检索的上限为 max_results × 主题数）
+        enrich_concurrency: 并发获取代码链接的线程数
+        watermark: 合并检索上次爬取到的最新论文；给定时只爬取比它更新的论文
+        max_crawl_results: 给定水位线时最多爬取的论文数量（默认同合并检索的上限）
+        categories: 可选的arXiv分类限制（如 ["cs.CV", "cs.RO"]）
+        github_batch_size: GitHub备用搜索每批的论文数（0表示不启用，见 resolve_github_code_links）
+    Returns:
+        两个值：
+        1. 论文数据列表（每个元素为{topic: {论文ID: PaperRecord}}，按配置中的主题顺序）
+        2. 本次爬取到的最新论文水位线（无新论文时沿用传入的水位线）
+    """
+    search_query = " OR ".join(f"({query})" for query in formatted_keywords.values())
+    if categories:
+        search_query = f"({search_query}) AND (" + " OR ".join(f"cat:{category}" for category in categories) + ")"
+    combined_max_results = max_results * len(formatted_keywords)
+    
+    papers = fetch_arxiv_results(
+        search_query,
+        max_results=(max_crawl_results or combined_max_results) if watermark else combined_max_results,
+        watermark=watermark,
+        page_size=combined_max_results
+    )
+    new_watermark = get_paper_watermark(papers[0]) if papers else watermark
+    
+    # 先在本地分类，丢弃不属于任何主题的论文（arXiv检索范围比标题+摘要更广）
+    matcher = KeywordMatcher(keywords)
+    paper_topics = [(paper, classify_paper_topics(paper.title, paper.summary, matcher)) for paper in papers]
+    paper_topics = [(paper, topics) for paper, topics in paper_topics if topics]
+    
+    # 每篇论文只获取一次代码链接
+    code_urls = resolve_code_links(
+        [get_clean_paper_id(paper.get_short_id()) for paper, _ in paper_topics],
+        max_workers=enrich_concurrency
+    )
+    github_urls = {}
+    if github_batch_size:
+        github_urls = resolve_github_code_links(
+            [clean_paper_id for clean_paper_id, code_url in code_urls.items() if not code_url], github_batch_size
+        )
+    
+    topic_records = {topic: {} for topic in formatted_keywords}
+    for paper, topics in paper_topics:
+        record = build_paper_record(paper, code_urls, github_urls)
+        for topic in topics:
+            if topic in topic_records:
+                topic_records[topic][record.id] = record
+    
+    return [{topic: records} for topic, records in topic_records.items()], new_watermark
+
+
+@_run_metrics.timed("update_paper_code_links")
+def update_paper_code_links(paper_store_backend: PaperStoreBackend, request_budget: int = 0,
+                            max_workers: int = 1) -> dict:
+    """
+    批量更新论文库中已存储论文的代码链接（用于定期补全缺失的代码链接）
+    
+    逻辑：先汇总所有主题中代码链接为空的论文（同一论文只查询一次），对已到重新查询时间
+    （见 CodeLinkCache）的论文并发请求PapersWithCode API，再将结果写回该论文出现的所有主题；
+    论文越新、查询未果的次数越少越优先，每次运行最多查询 request_budget 篇，其余留待下次运行
+    Args:
+        paper_store_backend: 论文库后端（见 open_paper_store）
+        request_budget: 本次运行最多查询的论文数；0表示不限制
+        max_workers: 并发查询的线程数（单主机并发另受 _host_limiter 限制）
+    Returns:
+        更新后的论文库字典
+    """
+    # 1. 读取论文库
+    paper_store = paper_store_backend.load()
+    changed_records = []
+    
+    # 2. 汇总代码链接为空的论文：{论文ID: [(主题, 论文记录), ...]}
+    missing_code_papers = {}
+    for topic, papers in paper_store.items():
+        for clean_paper_id, record in papers.items():
+            if not record.code_url:
+                missing_code_papers.setdefault(clean_paper_id, []).append((topic, record))
+    
+    # 3. 缓存命中的论文直接使用缓存结果，其余论文（从未查询过，或「无代码」结果已过期）等待查询
+    code_urls = {}
+    due_papers = []  # [(论文ID, 已查询次数), ...]
+    for clean_paper_id in missing_code_papers:
+        hit, code_url, check_count = (
+            _code_link_cache.lookup(clean_paper_id) if _code_link_cache is not None else (False, None, 0)
+        )
+        if hit:
+            code_urls[clean_paper_id] = code_url
         else:
-            list_item += "\n"
-        markdown_list_data[clean_paper_id] = list_item
+            due_papers.append((clean_paper_id, check_count))
+    
+    # 4. 按优先级选取本次查询的论文：论文越新越可能新增代码，其次查询未果的次数越少越优先
+    due_papers.sort(key=lambda item: (paper_age_days(item[0]), item[1]))
+    deferred_count = 0
+    if request_budget > 0 and len(due_papers) > request_budget:
+        # 超出预算的论文不入延后队列：下次运行仍按优先级与 CodeLinkCache 的重试间隔重新选取
+        deferred_count = len(due_papers) - request_budget
+        due_papers = due_papers[:request_budget]
+    code_urls.update(resolve_code_links([clean_paper_id for clean_paper_id, _ in due_papers], max_workers))
+    logging.info(
+        f"代码链接更新：{len(missing_code_papers)} 篇论文缺少代码链接，查询 {len(due_papers)} 篇，"
+        f"超出预算留待下次运行 {deferred_count} 篇"
+    )
+    _run_metrics.count("code_link_refresh_deferred", deferred_count)
+    
+    # 5. 将查到的代码链接写回该论文出现的所有主题
+    for clean_paper_id, code_url in code_urls.items():
+        if not code_url:
+            continue
+        for topic, record in missing_code_papers[clean_paper_id]:
+            record.code_url = code_url
+            changed_records.append((topic, record))
+        logging.info(f"论文ID {clean_paper_id} 成功补全代码链接")
     
-    return {topic: markdown_table_data}, {topic: markdown_list_data}
+    # 6. 写回更新后的论文库
+    paper_store_backend.save(paper_store, changed_records)
+    return paper_store
 
 
-def update_paper_code_links(json_file_path: str) -> None:
+@_run_metrics.timed("drain_deferred_enrichment")
+def drain_deferred_enrichment(paper_store_backend: PaperStoreBackend, paper_store: dict,
+                              time_budget_seconds: float, max_workers: int = 1,
+                              github_batch_size: int = 0) -> list[tuple[str, PaperRecord]]:
     """
-    批量更新JSON文件中已存储论文的代码链接（用于定期补全缺失的代码链接）
+    在时间预算内重新查询延后队列中的论文（最早入队的优先），查到的代码链接写回论文库；
+    启用GitHub备用搜索时，剩余的时间预算用于重新搜索 _deferred_github_search 中的论文
     
-    逻辑：解析JSON中存储的Markdown表格行，重新请求PapersWithCode API获取最新代码链接
+    查询成功（无论是否有代码）或遇到不可重试错误（如4xx、响应无法解析）的论文移出队列；
+    再次遇到瞬时错误的论文留在队列中并累计失败次数，由之后的运行继续处理（达到上限后移出）
     Args:
-        json_file_path: 存储论文数据的JSON文件路径
+        paper_store_backend: 论文库后端（见 open_paper_store）
+        paper_store: 当前论文库字典（会被原地更新）
+        time_budget_seconds: 时间预算（秒）；用尽后剩余论文留在队列中
+        max_workers: 并发查询的线程数（每批查询 max_workers 篇）
+        github_batch_size: GitHub备用搜索每批的论文数（0表示不处理GitHub搜索队列）
+    Returns:
+        补全了代码链接或相关仓库的 (主题, 论文记录) 列表
     """
-    def parse_paper_info_from_markdown(markdown_row: str) -> tuple[str, str, str, str, str]:
-        """辅助函数：从Markdown表格行中解析论文关键信息"""
-        parts = [part.strip() for part in markdown_row.split("|")]
-        # parts格式：["", 更新日期, 标题, 作者, 论文ID链接, 代码链接, ""]
-        update_date = parts[1]
-        title = parts[2]
-        authors = parts[3]
-        # 从 "[2108.09112](url)" 中提取纯净论文ID
-        paper_id = re.sub(r'v\d+', '', re.findall(r'\[(.*?)\]', parts[4])[0])
-        code_link = parts[5]
-        return update_date, title, authors, paper_id, code_link
+    # 论文ID → 该论文在论文库中的所有出现位置（代码链接为空的）
+    missing_code_papers = {}
+    for topic, papers in paper_store.items():
+        for clean_paper_id, record in papers.items():
+            if not record.code_url:
+                missing_code_papers.setdefault(clean_paper_id, []).append((topic, record))
     
-    # 1. 读取现有JSON数据
-    with open(json_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        paper_data = json.loads(content) if content else {}
-    
-    # 2. 遍历每篇论文，更新代码链接
-    for topic, papers in paper_data.items():
-        logging.info(f"开始更新主题「{topic}」的论文代码链接")
-        for paper_id, markdown_row in papers.items():
-            # 解析现有论文信息
-            update_date, title, authors, clean_paper_id, old_code_link = parse_paper_info_from_markdown(markdown_row)
-            
-            # 若原有代码链接为空（null），尝试重新获取
-            if old_code_link == "null":
-                try:
-                    # 重新请求PapersWithCode API
-                    pwc_api = f"{PAPERS_WITH_CODE_BASE_URL}{clean_paper_id}"
-                    response = requests.get(pwc_api)
-                    response.raise_for_status()
-                    pwc_data = response.json()
-                    
-                    if "official" in pwc_data and pwc_data["official"]:
-                        new_code_link = f"**[link]({pwc_data['official']['url']})**"
-                        # 替换Markdown行中的null为新链接
-                        new_markdown_row = markdown_row.replace("|null|", f"|{new_code_link}|")
-                        paper_data[topic][paper_id] = new_markdown_row
-                        logging.info(f"论文ID {clean_paper_id} 成功补全代码链接")
-                
-                except Exception as e:
-                    logging.error(f"更新论文ID {clean_paper_id} 代码链接失败，错误：{e}")
+    pending_ids = _deferred_enrichment.pending()
+    # 已不在论文库中、或已有代码链接的论文无需再查询
+    _deferred_enrichment.discard([clean_paper_id for clean_paper_id in pending_ids
+                                  if clean_paper_id not in missing_code_papers])
+    pending_ids = [clean_paper_id for clean_paper_id in pending_ids if clean_paper_id in missing_code_papers]
+    
+    changed_records = []
+    resolved_count = 0
+    deadline = time.monotonic() + time_budget_seconds
+    batch_size = max(1, max_workers)
+    for batch_start in range(0, len(pending_ids), batch_size):
+        if time.monotonic() >= deadline:
+            break
+        batch_ids = pending_ids[batch_start:batch_start + batch_size]
+        finished_ids = []
+        for clean_paper_id, (code_url, error) in try_resolve_code_links(batch_ids, max_workers).items():
+            if error is not None:
+                if isinstance(error, CircuitOpenError):
+                    continue  # 熔断时并未发出请求：留在队列中，不计入失败次数
+                if is_transient_error(error):
+                    _deferred_enrichment.add(clean_paper_id, str(error))  # 累计失败次数，达到上限时移出队列
+                else:
+                    logging.warning(f"论文ID {clean_paper_id} 查询失败且不可重试，移出延后队列：{error}")
+                    finished_ids.append(clean_paper_id)
+                continue
+            finished_ids.append(clean_paper_id)
+            resolved_count += 1
+            if not code_url:
+                continue
+            for topic, record in missing_code_papers[clean_paper_id]:
+                record.code_url = code_url
+                changed_records.append((topic, record))
+            logging.info(f"论文ID {clean_paper_id} 成功补全代码链接（延后队列）")
+        _deferred_enrichment.discard(finished_ids)
+    logging.info(f"延后队列：处理 {resolved_count}/{len(pending_ids)} 篇论文，补全 {len(changed_records)} 处代码链接")
     
-    # 3. 写回更新后的JSON数据
-    with open(json_file_path, "w", encoding="utf-8") as f:
-        json.dump(paper_data, f, indent=2)
+    if github_batch_size:
+        # 已不在论文库中、已有代码链接或相关仓库的论文无需再搜索
+        github_pending_ids = _deferred_github_search.pending()
+        github_due_ids = [clean_paper_id for clean_paper_id in github_pending_ids
+                          if any(not record.code_url and not record.github_url
+                                 for _, record in missing_code_papers.get(clean_paper_id, []))]
+        _deferred_github_search.discard(sorted(set(github_pending_ids) - set(github_due_ids)))
+        # 没有GITHUB_TOKEN时逐篇REST搜索：合并搜索的结果可能无法归属（见 search_github_code），逐篇搜索总能得出结论
+        drain_batch_size = github_batch_size if os.environ.get("GITHUB_TOKEN") else 1
+        for batch_start in range(0, len(github_due_ids), drain_batch_size):
+            if time.monotonic() >= deadline:
+                break
+            batch_ids = github_due_ids[batch_start:batch_start + drain_batch_size]
+            for clean_paper_id, github_url in resolve_github_code_links(batch_ids, drain_batch_size).items():
+                for topic, record in missing_code_papers[clean_paper_id]:
+                    record.github_url = github_url
+                    changed_records.append((topic, record))
+    
+    if changed_records:
+        paper_store_backend.save(paper_store, changed_records)
+    return changed_records
 
 
-def update_papers_json_file(json_file_path: str, new_papers_data: list[dict]) -> None:
+@_run_metrics.timed("update_papers_json_file")
+def update_papers_json_file(paper_store_backend: PaperStoreBackend,
+                            new_papers_data: list[dict]) -> dict:
     """
-    将新爬取的论文数据更新到JSON文件中（增量更新，不覆盖原有数据）
+    将新爬取的论文记录更新到论文库中（增量更新，不覆盖原有数据）
     
     Args:
-        json_file_path: 目标JSON文件路径
-        new_papers_data: 新爬取的论文数据列表（每个元素为{topic: 论文字典}）
+        paper_store_backend: 论文库后端（见 open_paper_store）
+        new_papers_data: 新爬取的论文数据列表（每个元素为{topic: {论文ID: PaperRecord}}）
+    Returns:
+        更新后的论文库字典
     """
-    # 1. 读取现有JSON数据
-    with open(json_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        existing_data = json.loads(content) if content else {}
+    # 1. 读取论文库
+    existing_data = paper_store_backend.load()
+    changed_records = []
     
-    # 2. 增量更新：添加新论文（若论文ID已存在，会覆盖旧数据）
+    # 2. 增量更新：添加新论文（若论文ID已存在，会覆盖旧数据）；只有新增或内容变化的论文计入变更
     for new_topic_data in new_papers_data:
         for topic, new_papers in new_topic_data.items():
-            if topic in existing_data:
-                # 若主题已存在，更新论文字典
-                existing_data[topic].update(new_papers)
-            else:
-                # 若主题不存在，新建主题条目
-                existing_data[topic] = new_papers
+            # 若主题不存在，新建主题条目
+            topic_papers = existing_data.setdefault(topic, {})
+            for paper_id, record in new_papers.items():
+                old_record = topic_papers.get(paper_id)
+                if old_record is None or old_record.to_dict() != record.to_dict():
+                    changed_records.append((topic, record))
+                topic_papers[paper_id] = record
     
     # 3. 写回更新后的数据
-    with open(json_file_path, "w", encoding="utf-8") as f:
-        json.dump(existing_data, f, indent=2)
+    paper_store_backend.save(existing_data, changed_records)
+    return existing_data
+
+
+# -------------------------- Markdown渲染（按主题分段渲染，带段落缓存） --------------------------
+def format_latex_formula(text: str) -> str:
+    """优化Markdown中的LaTeX公式格式（添加必要空格）"""
+    # 匹配 $...$ 格式的公式
+    formula_match = re.search(r"\$.*\$", text)
+    if not formula_match:
+        return text
+    
+    formula_start, formula_end = formula_match.span()
+    leading_space = ""
+    trailing_space = ""
+    
+    # 公式前若不是空格或星号，加空格
+    if formula_start > 0 and text[formula_start - 1] not in (" ", "*"):
+        trailing_space = " "
+    # 公式后若不是空格或星号，加空格
+    if formula_end < len(text) and text[formula_end] not in (" ", "*"):
+        leading_space = " "
+    
+    # 重构文本：原文本前半部分 + 优化后的公式 + 原文本后半部分
+    return (
+        text[:formula_start]
+        + f"{trailing_space}${formula_match.group()[1:-1].strip()}${leading_space}"
+        + text[formula_end:]
+    )
+
+
+class RenderCache:
+    """
+    主题段落渲染缓存：key为段落内容哈希（论文记录 + 渲染选项），value为渲染好的Markdown段落
+    
+    每个输出文件使用独立子目录，渲染完成后清理本次未用到的缓存文件
+    """
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.used_keys = set()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> str | None:
+        self.used_keys.add(key)
+        cache_file = os.path.join(self.cache_dir, f"{key}.md")
+        if not os.path.exists(cache_file):
+            self.misses += 1
+            return None
+        self.hits += 1
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return f.read()
+    
+    def put(self, key: str, section: str) -> None:
+        with open(os.path.join(self.cache_dir, f"{key}.md"), "w", encoding="utf-8") as f:
+            f.write(section)
+    
+    def prune(self) -> None:
+        """删除本次渲染未用到的缓存文件（对应内容已变化的主题）"""
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".md") and file_name[:-3] not in self.used_keys:
+                os.remove(os.path.join(self.cache_dir, file_name))
+
+
+# 渲染格式变化时递增，使旧缓存全部失效
+RENDER_CACHE_VERSION = 1
+
+
+def get_section_cache_key(topic: str, sorted_records: list[PaperRecord], render_options: tuple) -> str:
+    """计算主题段落的缓存key：主题名 + 渲染选项 + 每条论文记录中参与渲染的字段"""
+    digest = hashlib.sha256(repr((RENDER_CACHE_VERSION, topic, render_options)).encode("utf-8"))
+    for record in sorted_records:
+        digest.update("\x1f".join((
+            record.id, record.updated or "", record.title, record.first_author,
+            record.code_url or "", record.github_url or "", record.comment or ""
+        )).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def render_topic_section(topic: str, papers: dict, to_web: bool = False, use_title: bool = True,
+                         use_list: bool = False, render_cache: RenderCache | None = None) -> str:
+    """
+    渲染单个主题的Markdown段落（主题标题 + 表头 + 论文列表）；内容未变化时直接使用缓存
+    
+    Args:
+        topic: 主题名
+        papers: 该主题的论文字典（{论文ID: PaperRecord}）
+        to_web: 是否为GitPage生成（表头样式不同）
+        use_title: 是否写入表头
+        use_list: 是否渲染为列表（微信推送）；否则渲染为表格
+        render_cache: 段落渲染缓存；为None时不使用缓存
+    Returns:
+        Markdown段落
+    """
+    # 按论文ID倒序排序（最新在前）
+    sorted_records = list(sort_papers_by_id_desc(papers).values())
+    
+    cache_key = None
+    if render_cache is not None:
+        cache_key = get_section_cache_key(topic, sorted_records, (to_web, use_title, use_list))
+        cached_section = render_cache.get(cache_key)
+        if cached_section is not None:
+            return cached_section
+    
+    render_row = render_list_item if use_list else render_table_row
+    # 主题标题
+    section_parts = [f"## {topic}\n\n"]
+    
+    # 若为表格格式（README/GitPage），写入表头
+    if use_title and not to_web:
+        section_parts.append("|Publish Date|Title|Authors|PDF|Code|\n|---|---|---|---|---|\n")
+    elif use_title and to_web:
+        section_parts.append("| Publish Date | Title | Authors | PDF | Code |\n|:---------|:-----------------------|:---------|:------|:------|\n")
+    
+    # 渲染每篇论文的信息（优化LaTeX格式）
+    section_parts.extend(format_latex_formula(render_row(record)) for record in sorted_records)
+    section_parts.append("\n")
+    section = "".join(section_parts)
+    
+    if render_cache is not None:
+        render_cache.put(cache_key, section)
+    return section
+
+
+def get_topic_slug(topic: str) -> str:
+    """主题名转为小写+连字符形式（如 "Image Matching" → "image-matching"），用于锚点与归档目录名"""
+    return re.sub(r"[^0-9a-z\-]+", "-", topic.replace(" ", "-").lower()).strip("-")
+
+
+def group_papers_by_month(papers: dict) -> dict[str, dict]:
+    """
+    按论文ID中的提交月份对论文分组
+    
+    Args:
+        papers: 论文字典（{论文ID: PaperRecord}）
+    Returns:
+        {月份标签: {论文ID: PaperRecord}}，最新月份在前
+    """
+    monthly_papers = {}
+    for paper_id, record in papers.items():
+        monthly_papers.setdefault(get_paper_month(paper_id), {})[paper_id] = record
+    return dict(sorted(monthly_papers.items(), reverse=True))
+
+
+def get_archive_page_name(month: str, page_number: int) -> str:
+    """归档分页文件名：第1页为 "2024-10.md"，之后为 "2024-10-p2.md"、"2024-10-p3.md" ..."""
+    return f"{month}.md" if page_number == 1 else f"{month}-p{page_number}.md"
+
+
+def write_gitpage_archive(paper_store: dict, archive_dir: str, page_size: int,
+                          dirty_months: set[str] | None = None) -> dict[str, list[tuple[str, int, int]]]:
+    """
+    生成GitPage的按主题、按月份归档页（archive_dir/<主题>/<月份>.md），每页最多page_size篇论文
+    
+    只重新生成dirty_months中的月份及尚不存在的归档页，其余月份的归档页保持不变
+    
+    Args:
+        paper_store: 论文库字典（{主题: {论文ID: PaperRecord}}）
+        archive_dir: 归档根目录
+        page_size: 每页最多论文数
+        dirty_months: 本次运行有变化的月份；为None时重新生成所有月份
+    Returns:
+        归档索引 {主题: [(月份, 论文数, 页数), ...]}，最新月份在前
+    """
+    page_size = max(1, page_size)
+    archive_index = {}
+    regenerated_pages = 0
+    for topic, papers in paper_store.items():
+        if not papers:
+            continue
+        topic_slug = get_topic_slug(topic)
+        topic_dir = os.path.join(archive_dir, topic_slug)
+        archive_index[topic] = []
+        for month, monthly_papers in group_papers_by_month(papers).items():
+            sorted_ids = list(sort_papers_by_id_desc(monthly_papers))
+            page_count = (len(sorted_ids) + page_size - 1) // page_size
+            archive_index[topic].append((month, len(sorted_ids), page_count))
+            
+            month_is_dirty = dirty_months is None or month in dirty_months
+            if not month_is_dirty and os.path.exists(os.path.join(topic_dir, get_archive_page_name(month, page_count))):
+                continue
+            
+            os.makedirs(topic_dir, exist_ok=True)
+            for page_number in range(1, page_count + 1):
+                page_ids = sorted_ids[(page_number - 1) * page_size:page_number * page_size]
+                # 分页导航：当前页加粗，其余页为链接
+                page_links = " ".join(
+                    f"**{number}**" if number == page_number else f"[{number}]({get_archive_page_name(month, number)})"
+                    for number in range(1, page_count + 1)
+                )
+                page_content = (
+                    "---\nlayout: default\n---\n\n"
+                    f"[Home](../../index.md#{topic_slug}) · Pages: {page_links}\n\n"
+                    + render_topic_section(f"{topic} ({month})", {paper_id: monthly_papers[paper_id] for paper_id in page_ids},
+                                           to_web=True, use_title=True)
+                )
+                if write_text_if_changed(os.path.join(topic_dir, get_archive_page_name(month, page_number)), page_content):
+                    regenerated_pages += 1
+    logging.info(f"GitPage归档：更新 {regenerated_pages} 个归档页（目录：{archive_dir}）")
+    return archive_index
 
 
-def convert_json_to_markdown(json_file_path: str, md_file_path: str, 
+def split_recent_papers(papers: dict, window_days: int = 0, max_papers: int = 0) -> tuple[dict, dict]:
+    """
+    将论文分为「近期论文」与「已移出窗口的历史论文」
+    
+    Args:
+        papers: 论文字典（{论文ID: PaperRecord}）
+        window_days: 只保留最近window_days天内发表的论文；0表示不限制
+        max_papers: 最多保留的最新论文数；0表示不限制
+    Returns:
+        (近期论文字典, 历史论文字典)，均按论文ID倒序
+    """
+    sorted_papers = sort_papers_by_id_desc(papers)
+    recent_ids = list(sorted_papers)
+    if window_days > 0:
+        cutoff_date = (datetime.date.today() - datetime.timedelta(days=window_days)).isoformat()
+        recent_ids = [paper_id for paper_id in recent_ids
+                      if (sorted_papers[paper_id].published or sorted_papers[paper_id].updated or "") >= cutoff_date]
+    if max_papers > 0:
+        recent_ids = recent_ids[:max_papers]
+    recent_id_set = set(recent_ids)
+    recent_papers = {paper_id: sorted_papers[paper_id] for paper_id in recent_ids}
+    archived_papers = {paper_id: record for paper_id, record in sorted_papers.items() if paper_id not in recent_id_set}
+    return recent_papers, archived_papers
+
+
+@_run_metrics.timed("convert_json_to_markdown")
+def convert_json_to_markdown(paper_store: dict, md_file_path: str, 
                             task_name: str = "", to_web: bool = False,
                             use_title: bool = True, use_toc: bool = True,
-                            show_badge: bool = True, use_back_to_top: bool = True) -> None:
+                            show_badge: bool = True, use_back_to_top: bool = True,
+                            use_list: bool = False, render_cache_dir: str | None = None,
+                            archive_page_size: int | None = None, landing_rows: int = 10,
+                            dirty_months: set[str] | None = None, window_days: int = 0,
+                            max_papers_per_topic: int = 0, archive_link_dir: str | None = None) -> None:
     """
-    将JSON中的论文数据转换为Markdown文件（支持README、GitPage、微信推送等多种格式）
+    将论文库中的论文记录渲染为Markdown文件（支持README、GitPage、微信推送等多种格式）
     
     Args:
-        json_file_path: 存储论文数据的JSON文件路径
+        paper_store: 论文库字典（{主题: {论文ID: PaperRecord}}）
         md_file_path: 输出的Markdown文件路径
         task_name: 任务名称（用于日志）
         to_web: 是否为GitPage生成（需适配网页布局）
         use_title: 是否添加标题和更新时间
+        use_list: 是否渲染为列表（微信推送）；否则渲染为表格
         use_toc: 是否生成目录
         show_badge: 是否显示GitHub徽章（星数、分支等）
         use_back_to_top: 是否添加「返回顶部」链接
+        render_cache_dir: 主题段落渲染缓存目录；只重新渲染内容有变化的主题，为None时不使用缓存
+        archive_page_size: GitPage分页：每个归档页最多论文数；为None时不分页，所有论文写入同一页面
+        landing_rows: GitPage分页：首页每个主题展示的最新论文数（其余论文见按月归档页）
+        dirty_months: GitPage分页：本次运行有变化的月份（只重新生成这些月份的归档页）；为None时全部重新生成
+        window_days: 滚动窗口：只保留最近window_days天内发表的论文；0表示不限制
+        max_papers_per_topic: 滚动窗口：每个主题最多保留的最新论文数；0表示不限制
+        archive_link_dir: 滚动窗口：GitPage归档根目录（见 write_gitpage_archive），移出窗口的论文链接到其中的
+            按月归档页；为None时不启用滚动窗口
     """
-    def format_latex_formula(text: str) -> str:
-        """辅助函数：优化Markdown中的LaTeX公式格式（添加必要空格）"""
-        # 匹配 $...$ 格式的公式
-        formula_match = re.search(r"\$.*\$", text)
-        if not formula_match:
-            return text
-        
-        formula_start, formula_end = formula_match.span()
-        leading_space = ""
-        trailing_space = ""
-        
-        # 公式前若不是空格或星号，加空格
-        if formula_start > 0 and text[formula_start - 1] not in (" ", "*"):
-            trailing_space = " "
-        # 公式后若不是空格或星号，加空格
-        if formula_end < len(text) and text[formula_end] not in (" ", "*"):
-            leading_space = " "
-        
-        # 重构文本：原文本前半部分 + 优化后的公式 + 原文本后半部分
-        return (
-            text[:formula_start]
-            + f"{trailing_space}${formula_match.group()[1:-1].strip()}${leading_space}"
-            + text[formula_end:]
-        )
+    paper_data = paper_store
+    render_cache = None
+    if render_cache_dir:
+        # 每个输出文件使用独立的缓存子目录（如 "README.md" → "README_md"）
+        view_name = re.sub(r"[^0-9A-Za-z]+", "_", os.path.normpath(md_file_path)).strip("_")
+        render_cache = RenderCache(os.path.join(render_cache_dir, view_name))
     
-    # 1. 读取JSON数据
-    with open(json_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        paper_data = json.loads(content) if content else {}
+    # GitPage分页：先生成按主题、按月份的归档页，首页只保留每个主题的最新论文及归档链接
+    archive_index = None
+    if to_web and archive_page_size:
+        archive_dir = os.path.join(os.path.dirname(md_file_path), "archive")
+        archive_index = write_gitpage_archive(paper_data, archive_dir, archive_page_size, dirty_months)
     
-    # 2. 获取当前日期（用于标题）
+    # 1. 获取当前日期（用于标题）
     current_date = datetime.date.today().strftime("%Y.%m.%d")
     
-    # 3. 清空原有Markdown文件，准备写入新内容
-    with open(md_file_path, "w", encoding="utf-8") as f:
-        pass
-    
-    # 4. 写入Markdown内容
-    with open(md_file_path, "a", encoding="utf-8") as f:
+    # 2. 在内存中生成Markdown内容
+    with StringIO() as f:
         # 若为GitPage，添加Jekyll布局头
         if to_web and use_title:
             f.write("---\nlayout: default\n---\n\n")
@@ -428,24 +2698,35 @@ def convert_json_to_markdown(json_file_path: str, md_file_path: str,
             if not papers:  # 若该主题无论文，跳过
                 continue
             
-            # 主题标题
-            f.write(f"## {topic}\n\n")
+            archived_papers = None
+            if archive_link_dir and (window_days > 0 or max_papers_per_topic > 0):
+                # 滚动窗口：只渲染近期论文，移出窗口的论文见GitPage的按月归档页
+                papers, archived_papers = split_recent_papers(papers, window_days, max_papers_per_topic)
             
-            # 若为表格格式（README/GitPage），写入表头
-            if use_title and not to_web:
-                f.write("|Publish Date|Title|Authors|PDF|Code|\n|---|---|---|---|---|\n")
-            elif use_title and to_web:
-                f.write("| Publish Date | Title | Authors | PDF | Code |\n|:---------|:-----------------------|:---------|:------|:------|\n")
+            if archive_index is not None:
+                # 分页首页：只展示最新的landing_rows篇论文，并链接到各月份归档页
+                latest_ids = list(sort_papers_by_id_desc(papers))[:landing_rows]
+                papers = {paper_id: papers[paper_id] for paper_id in latest_ids}
             
-            # 按论文ID倒序排序（最新在前）
-            sorted_papers = sort_papers_by_id_desc(papers)
+            # 主题段落（主题标题 + 表头 + 论文列表），内容未变化时直接使用缓存
+            f.write(render_topic_section(topic, papers, to_web, use_title, use_list, render_cache))
             
-            # 写入每篇论文的信息（优化LaTeX格式）
-            for _, markdown_content in sorted_papers.items():
-                if markdown_content:
-                    f.write(format_latex_formula(markdown_content))
+            if archive_index is not None:
+                topic_slug = get_topic_slug(topic)
+                archive_links = " · ".join(
+                    f"[{month}](archive/{topic_slug}/{get_archive_page_name(month, 1)}) ({paper_count})"
+                    for month, paper_count, _ in archive_index[topic]
+                )
+                f.write(f"Archive: {archive_links}\n\n")
             
-            f.write("\n")
+            if archived_papers:
+                archive_topic_dir = os.path.relpath(os.path.join(archive_link_dir, get_topic_slug(topic)),
+                                                    os.path.dirname(md_file_path) or ".").replace(os.sep, "/")
+                archive_links = " · ".join(
+                    f"[{month}]({archive_topic_dir}/{get_archive_page_name(month, 1)}) ({len(monthly_papers)})"
+                    for month, monthly_papers in group_papers_by_month(archived_papers).items()
+                )
+                f.write(f"Older papers: {archive_links}\n\n")
             
             # 添加「返回顶部」链接
             if use_back_to_top:
@@ -465,8 +2746,19 @@ def convert_json_to_markdown(json_file_path: str, md_file_path: str,
                 "[issues-url]: https://github.com/Vincentqyw/cv-arxiv-daily/issues\n\n"
             )
             f.write(badge_template)
+        
+        # 3. 仅当内容（忽略日期）变化时写入文件
+        written = write_text_if_changed(md_file_path, f.getvalue(), volatile_pattern=VOLATILE_DATE_PATTERN)
     
-    logging.info(f"任务「{task_name}」完成：已生成Markdown文件 {md_file_path}")
+    if render_cache is not None:
+        render_cache.prune()
+        _run_metrics.count("render_cache_hits", render_cache.hits)
+        _run_metrics.count("render_cache_misses", render_cache.misses)
+        logging.info(f"任务「{task_name}」渲染缓存：命中 {render_cache.hits} 个主题，重新渲染 {render_cache.misses} 个主题")
+    if written:
+        logging.info(f"任务「{task_name}」完成：已生成Markdown文件 {md_file_path}")
+    else:
+        logging.info(f"任务「{task_name}」完成：论文无变化，保留原Markdown文件 {md_file_path}")
 
 
 # -------------------------- 主工作流程 --------------------------
@@ -480,53 +2772,141 @@ def main_workflow(config: dict) -> None:
     # 从配置中提取关键参数（避免重复写config["key"]）
     formatted_keywords = config["formatted_keywords"]
     max_results = config["max_results"]
+    crawl_concurrency = max(1, int(config.get("crawl_concurrency", 1)))  # 并发爬取的主题数
+    enrich_concurrency = max(1, int(config.get("enrich_concurrency", 1)))  # 每个主题并发获取代码链接的线程数
+    _host_limiter.set_limit(int(config.get("per_host_concurrency", DEFAULT_PER_HOST_CONCURRENCY)))
+    _rate_limiter.configure(parse_rate_limits(config))  # 按接口限速（令牌桶）
+    # 瞬时错误重试与按主机熔断
+    _retry_policy.max_retries = max(0, int(config.get("http_max_retries", DEFAULT_HTTP_MAX_RETRIES)))
+    _retry_policy.backoff_seconds = float(config.get("http_retry_backoff_seconds", DEFAULT_HTTP_RETRY_BACKOFF_SECONDS))
+    _circuit_breaker.reset(int(config.get("circuit_breaker_threshold", DEFAULT_CIRCUIT_BREAKER_THRESHOLD)))
+    _deferred_enrichment.open(config.get("deferred_queue_path"))  # 之前运行留下的待补全论文
+    _deferred_enrichment.max_attempts = int(config.get("deferred_max_attempts", DEFAULT_DEFERRED_MAX_ATTEMPTS))
+    _deferred_github_search.open(config.get("deferred_queue_path"))
+    _deferred_github_search.max_attempts = _deferred_enrichment.max_attempts
+    _run_metrics.reset()  # 本次运行的各阶段耗时与计数
+    configure_http_session(config)  # 所有外部请求共享同一个连接池
+    configure_code_link_cache(config)  # 代码链接查询结果的本地缓存
+    if config.get("pwc_dump_path"):
+        # 先导入PapersWithCode离线数据，之后的代码链接查询优先使用本地索引
+        ingest_pwc_dump(config["pwc_dump_path"])
     update_only_links = config["update_paper_links"]  # 是否仅更新代码链接，不爬新论文
+    retag_only = config.get("retag_papers", False)  # 是否仅按当前过滤器重新分类论文库，不爬新论文
     
     # 功能开关
     publish_readme = config["publish_readme"]
     publish_gitpage = config["publish_gitpage"]
     publish_wechat = config["publish_wechat"]
     show_github_badge = config["show_badge"]
+    render_cache_dir = config.get("render_cache_dir")  # 主题段落渲染缓存目录
+    
+    # 论文库：唯一的数据源，README/GitPage/微信推送均由其渲染
+    paper_store_backend = open_paper_store(config)
     
-    # 存储新爬取的论文数据
-    new_table_data = []  # 表格格式（README/GitPage）
-    new_list_data = []   # 列表格式（微信）
+    # 增量爬取：每个主题记录上次爬取到的最新论文（水位线），下次只爬取更新的论文
+    incremental_crawl = config.get("incremental_crawl", False)
+    crawl_state_path = config.get("crawl_state_path")
+    crawl_state = load_crawl_state(crawl_state_path) if incremental_crawl else {}
+    max_crawl_results = int(config.get("max_crawl_results", max_results))
+    # 爬取模式：per_topic（每个主题单独检索）或 combined（合并为一次检索，本地分类）
+    crawl_mode = config.get("crawl_mode", "per_topic")
+    # GitHub备用搜索：PapersWithCode无代码的新论文批量搜索GitHub仓库（0表示不启用）
+    github_batch_size = (int(config.get("github_batch_size", DEFAULT_GITHUB_BATCH_SIZE))
+                         if config.get("github_fallback", False) else 0)
     
-    # -------------------------- 步骤1：爬取新论文 或 仅更新代码链接 --------------------------
-    if not update_only_links:
-        logging.info("开始爬取arXiv每日新论文...")
-        # 遍历每个主题，爬取对应论文
-        for topic, search_query in formatted_keywords.items():
+    # 存储新爬取的论文记录
+    new_papers_data = []
+    # 本次运行有变化的月份（GitPage分页只重新生成这些月份的归档页）；为None时全部重新生成
+    dirty_months = None
+    
+    # -------------------------- 步骤1：爬取新论文 或 仅更新代码链接 或 仅重新分类 --------------------------
+    if retag_only:
+        logging.info("启用「重新分类」模式：按当前过滤器对论文库重新分类，不爬取新论文")
+        paper_store = retag_paper_store(paper_store_backend, config["keywords"])
+    elif not update_only_links:
+        logging.info(f"开始爬取arXiv每日新论文（模式：{crawl_mode}，并发数：{crawl_concurrency}）...")
+        
+        def crawl_topic(topic_item: tuple[str, str]) -> tuple[dict, dict | None]:
+            """辅助函数：爬取单个主题，获取论文记录及新的水位线"""
+            topic, search_query = topic_item
             logging.info(f"正在爬取主题：{topic}（搜索关键词：{search_query}）")
-            # 爬取论文，获取两种格式的数据
-            table_data, list_data = fetch_daily_arxiv_papers(
+            return fetch_daily_arxiv_papers(
                 topic=topic,
                 search_query=search_query,
-                max_results=max_results
+                max_results=max_results,
+                enrich_concurrency=enrich_concurrency,
+                watermark=crawl_state.get(topic),
+                max_crawl_results=max_crawl_results,
+                github_batch_size=github_batch_size
             )
-            new_table_data.append(table_data)
-            new_list_data.append(list_data)
+        
+        new_watermarks = {}
+        if crawl_mode == "combined":
+            # 合并爬取：一次arXiv检索覆盖所有主题，本地分类
+            combined_data, new_watermarks[COMBINED_CRAWL_STATE_KEY] = fetch_combined_arxiv_papers(
+                keywords=config["keywords"],
+                formatted_keywords=formatted_keywords,
+                max_results=max_results,
+                enrich_concurrency=enrich_concurrency,
+                watermark=crawl_state.get(COMBINED_CRAWL_STATE_KEY),
+                max_crawl_results=max_crawl_results,
+                categories=config.get("combined_categories"),
+                github_batch_size=github_batch_size
+            )
+            new_papers_data.extend(combined_data)
+        else:
+            # 多个主题并发爬取；executor.map 按配置顺序返回结果，保证输出确定
+            with ThreadPoolExecutor(max_workers=crawl_concurrency) as executor:
+                for topic, (topic_data, watermark) in zip(
+                        formatted_keywords, executor.map(crawl_topic, formatted_keywords.items())):
+                    new_papers_data.append(topic_data)
+                    new_watermarks[topic] = watermark
         logging.info("新论文爬取完成！")
+        
+        # 增量更新新论文到论文库
+        paper_store = update_papers_json_file(paper_store_backend, new_papers_data)
+        
+        dirty_months = {get_paper_month(paper_id) for topic_data in new_papers_data
+                        for papers in topic_data.values() for paper_id in papers}
+        
+        # 在时间预算内补全延后队列中论文的代码链接（之前运行中请求失败或超出预算的论文）
+        deferred_drain_seconds = float(config.get("deferred_drain_seconds", 0))
+        if deferred_drain_seconds > 0:
+            drained_records = drain_deferred_enrichment(paper_store_backend, paper_store, deferred_drain_seconds,
+                                                        max_workers=enrich_concurrency,
+                                                        github_batch_size=github_batch_size)
+            dirty_months.update(get_paper_month(record.id) for _, record in drained_records)
+        
+        # 论文库写入成功后再推进水位线，避免中途失败导致漏爬
+        if incremental_crawl:
+            crawl_state.update({topic: wm for topic, wm in new_watermarks.items() if wm})
+            save_crawl_state(crawl_state_path, crawl_state)
     else:
         logging.info("启用「仅更新代码链接」模式，不爬取新论文")
+        paper_store = update_paper_code_links(
+            paper_store_backend,
+            request_budget=int(config.get("pwc_refresh_budget", 0)),
+            max_workers=enrich_concurrency
+        )
+    
+    # SQLite后端：论文库JSON文件作为导出目标（便于在仓库中查看与比较）
+    if isinstance(paper_store_backend, SqlitePaperStore):
+        if config.get("export_json", True):
+            save_paper_store(config["json_store_path"], paper_store)
+        paper_store_backend.close()
     
     # -------------------------- 步骤2：更新README.md（本地文档） --------------------------
     if publish_readme:
-        json_path = config["json_readme_path"]
-        md_path = config["md_readme_path"]
-        
-        if update_only_links:
-            # 仅更新代码链接
-            update_paper_code_links(json_path)
-        else:
-            # 增量更新新论文到JSON
-            update_papers_json_file(json_path, new_table_data)
-        
-        # 转换JSON为Markdown
         convert_json_to_markdown(
-            json_file_path=json_path,
-            md_file_path=md_path,
+            paper_store=paper_store,
+            md_file_path=config["md_readme_path"],
             task_name="更新README",
+            render_cache_dir=render_cache_dir,
+            window_days=int(config.get("readme_window_days", 0)),
+            max_papers_per_topic=int(config.get("readme_max_per_topic", 0)),
+            # 移出窗口的论文链接到GitPage按月归档页：仅在生成归档页（gitpage_paginate）时启用滚动窗口
+            archive_link_dir=(os.path.join(os.path.dirname(config["md_gitpage_path"]), "archive")
+                              if publish_gitpage and config.get("gitpage_paginate", False) else None),
             show_badge=show_github_badge,
             use_toc=True,
             use_back_to_top=True
@@ -534,44 +2914,67 @@ def main_workflow(config: dict) -> None:
     
     # -------------------------- 步骤3：更新GitPage（网页展示） --------------------------
     if publish_gitpage:
-        json_path = config["json_gitpage_path"]
-        md_path = config["md_gitpage_path"]
-        
-        if update_only_links:
-            update_paper_code_links(json_path)
-        else:
-            update_papers_json_file(json_path, new_table_data)
-        
         convert_json_to_markdown(
-            json_file_path=json_path,
-            md_file_path=md_path,
+            paper_store=paper_store,
+            md_file_path=config["md_gitpage_path"],
             task_name="更新GitPage",
+            render_cache_dir=render_cache_dir,
             to_web=True,  # 适配网页布局
             show_badge=show_github_badge,
             use_toc=False,  # 网页可能不需要目录
-            use_back_to_top=False
+            use_back_to_top=False,
+            archive_page_size=int(config.get("gitpage_page_size", 200)) if config.get("gitpage_paginate", False) else None,
+            landing_rows=int(config.get("gitpage_landing_rows", 10)),
+            dirty_months=dirty_months
         )
     
     # -------------------------- 步骤4：更新微信推送文档 --------------------------
     if publish_wechat:
-        json_path = config["json_wechat_path"]
-        md_path = config["md_wechat_path"]
-        
-        if update_only_links:
-            update_paper_code_links(json_path)
-        else:
-            # 微信用列表格式的数据
-            update_papers_json_file(json_path, new_list_data)
-        
         convert_json_to_markdown(
-            json_file_path=json_path,
-            md_file_path=md_path,
+            paper_store=paper_store,
+            md_file_path=config["md_wechat_path"],
             task_name="更新微信推送",
+            render_cache_dir=render_cache_dir,
             use_title=False,  # 微信推送不需要大标题
+            use_list=True,  # 微信推送使用列表格式
             show_badge=show_github_badge,
             use_toc=False,
             use_back_to_top=False
         )
+    
+    # 仍未能获取代码链接的论文（请求失败或主机熔断），留待之后的运行重新查询
+    if len(_deferred_enrichment):
+        logging.info(f"延后队列中还有 {len(_deferred_enrichment)} 篇论文等待补全代码链接")
+    _run_metrics.count("code_link_deferred", len(_deferred_enrichment))
+    if len(_deferred_github_search):
+        logging.info(f"GitHub搜索延后队列中还有 {len(_deferred_github_search)} 篇论文等待重新搜索")
+    _run_metrics.count("github_search_deferred", len(_deferred_github_search))
+    
+    # -------------------------- 步骤5：写入运行指标 --------------------------
+    run_metrics_path = config.get("run_metrics_path")
+    if run_metrics_path:
+        _run_metrics.write(run_metrics_path)
+        logging.info(f"运行指标已写入 {run_metrics_path}（总耗时 {_run_metrics.to_dict()['wall_time_seconds']} 秒）")
+
+
+def query_workflow(config: dict, topic: str | None = None, since: str | None = None,
+                   has_code: bool | None = None) -> None:
+    """
+    查询模式：按条件查询论文库（见 query_papers），每行向标准输出写一条论文记录（JSON），不爬取新论文
+    
+    Args:
+        config: 完整配置字典（使用其中的论文库配置）
+        topic / since / has_code: 查询条件，含义同 query_papers
+    """
+    paper_store_backend = open_paper_store(config)
+    paper_store = paper_store_backend.load()
+    if isinstance(paper_store_backend, SqlitePaperStore):
+        paper_store_backend.close()
+    
+    records = query_papers(paper_store, topic=topic, since=since, has_code=has_code)
+    for record in records:
+        print(json.dumps(record.to_dict(), ensure_ascii=False))
+    logging.info(f"查询完成：共 {len(records)} 篇论文")
 
 
 # -------------------------- 程序入口 --------------------------
@@ -590,11 +2993,59 @@ if __name__ == "__main__":
         default=False,
         help="是否仅更新论文代码链接，不爬取新论文（用于定期补全链接）"
     )
+    parser.add_argument(
+        "--retag",
+        action="store_true",
+        default=False,
+        help="是否仅按当前配置的过滤器对论文库重新分类，不爬取新论文（新增过滤器或主题后使用）"
+    )
+    parser.add_argument(
+        "--ingest-pwc-dump",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="先将PapersWithCode离线数据（links-between-papers-and-code.json.gz）导入本地代码链接索引，再执行本次运行"
+    )
+    # 查询论文库（不爬取）：每行输出一条论文记录（JSON）
+    parser.add_argument(
+        "--query",
+        action="store_true",
+        default=False,
+        help="查询模式：按 --topic / --since / --has-code 条件查询论文库并输出JSON行，不爬取新论文"
+    )
+    parser.add_argument("--topic", type=str, default=None, help="查询模式：仅查询该主题")
+    parser.add_argument("--since", type=str, default=None, metavar="YYYY-MM-DD",
+                        help="查询模式：仅返回更新日期不早于该日期的论文")
+    parser.add_argument("--has-code", action=argparse.BooleanOptionalAction, default=None,
+                        help="查询模式：--has-code 仅返回有代码的论文，--no-has-code 仅返回无代码的论文")
+    # 录制/回放所有外部HTTP请求（arXiv、PapersWithCode、GitHub），二者互斥
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="录制模式：正常请求，并将每个请求的响应保存到DIR（建议在清空本地缓存后录制，以覆盖全部请求）"
+    )
+    cassette_group.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="回放模式：只从DIR读取录制的响应，不访问网络（用于离线、可重复的性能分析与回归测试）"
+    )
     args = parser.parse_args()
     
     # 加载配置 + 合并命令行参数（命令行参数优先级高于配置文件）
     config = load_config(args.config_path)
     config["update_paper_links"] = args.update_paper_links  # 覆盖配置文件中的开关
+    config["retag_papers"] = args.retag
+    config["http_record_dir"] = args.record
+    config["pwc_dump_path"] = args.ingest_pwc_dump
+    config["http_replay_dir"] = args.replay
     
-    # 启动主工作流程
-    main_workflow(config)
\ No newline at end of file
+    if args.query:
+        query_workflow(config, topic=args.topic, since=args.since, has_code=args.has_code)
+    else:
+        # 启动主工作流程
+        main_workflow(config)
\ No newline at end of file